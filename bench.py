@@ -0,0 +1,275 @@
+"""
+Benchmark runner for the daily solvers.
+
+Times parsing, part 1 and part 2 separately for every input file found, records
+peak memory use and writes the results as JSON. Results can be compared against
+a previously stored baseline to catch performance regressions.
+
+Usage:
+    python3 bench.py [DAY ...] [--input-dir DIR] [--synthetic SCALE] [--seed SEED]
+                     [--repeat N] [--output FILE] [--baseline FILE]
+                     [--threshold FRACTION]
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+import day01
+import day02
+import day03
+import day04
+import day05
+import day06
+import day07
+import day08
+import day09
+import day10
+import day11
+import day12
+import day13
+import day14
+import day15
+import day16
+import day17
+import day18
+import day19
+import day20
+from generate import GENERATORS, generate_scaled
+from lib import Point
+
+Results = dict[str, dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Solver:
+    parse: Callable[[str], Any]
+    part1: Callable[[Any], Any]
+    part2: Optional[Callable[[Any], Any]] = None
+
+
+def parse_day18(data: str) -> day18.Grid:
+    # synthetic inputs come in different sizes, so the goal is the furthest corner
+    grid = day18.Grid.from_string(data)
+    grid.goal = Point(max(p.x for p in grid.incoming), max(p.y for p in grid.incoming))
+    return grid
+
+
+def run_day17(cpu: day17.Cpu) -> str:
+    cpu.run()
+    return cpu.stdout()
+
+
+SOLVERS: dict[int, Solver] = {
+    1: Solver(day01.parse_pairs, day01.total_distance, day01.similarity_score),
+    2: Solver(day02.parse_reports, day02.safe_count, day02.safe_count_with_tolerance),
+    3: Solver(
+        lambda data: data,
+        lambda data: day03.MulComputer(data).run(),
+        lambda data: day03.Computer(data).run(),
+    ),
+    4: Solver(
+        day04.Grid.from_string,
+        lambda grid: grid.count_occurrences("XMAS"),
+        lambda grid: grid.count_patterns(day04.make_patterns()),
+    ),
+    5: Solver(
+        day05.manual_updates_from_string,
+        day05.sum_of_correct_updates,
+        day05.sum_of_incorrect_updates,
+    ),
+    6: Solver(
+        day06.parse_map,
+        lambda parsed: day06.count_guard_positions(*parsed),
+        lambda parsed: day06.count_looping_configurations(*parsed),
+    ),
+    7: Solver(
+        day07.parse_equations,
+        day07.sum_of_true_equations,
+        lambda equations: day07.sum_of_true_equations(equations, enable_concat=True),
+    ),
+    8: Solver(day08.parse_grid, day08.count_antinodes, day08.count_antinodes_harmonic),
+    9: Solver(
+        day09.parse_lengths, day09.compact_checksum, day09.whole_file_checksum
+    ),
+    10: Solver(
+        day10.Grid.from_string,
+        day10.count_distinct_trailheads,
+        day10.sum_trail_ratings,
+    ),
+    11: Solver(
+        day11.parse_stones,
+        lambda stones: day11.blink(stones, n=25),
+        lambda stones: day11.blink(stones, n=75),
+    ),
+    12: Solver(day12.parse_regions, day12.total_price, day12.discounted_price),
+    13: Solver(
+        day13.parse_machines,
+        day13.best_total_tokens,
+        lambda machines: day13.best_total_tokens(
+            day13.fix_conversion_error(machines)
+        ),
+    ),
+    # Part 2 of day 14 is solved by browsing generated images, so it can't be timed
+    14: Solver(
+        day14.Simulation.from_string,
+        lambda sim: day14.safety_factor(sim.simulate(100)),
+    ),
+    15: Solver(
+        lambda data: data,
+        lambda data: day15.sum_of_gps_coordinates(
+            day15.Simulation.from_string(data).simulate()
+        ),
+        lambda data: day15.sum_of_gps_coordinates(
+            day15.WideSimulation.from_string(data).simulate()
+        ),
+    ),
+    16: Solver(day16.Maze.from_string, day16.best_score, day16.best_path_tiles),
+    17: Solver(day17.Cpu.from_string, run_day17, day17.find_a),
+    18: Solver(
+        parse_day18,
+        lambda grid: day18.shortest_path_length(grid.simulate(n=1024)),
+        day18.first_blocking_coordinate,
+    ),
+    19: Solver(
+        day19.parse_towels,
+        lambda parsed: day19.count_possible_designs(*parsed),
+        lambda parsed: day19.count_possible_arrangements(*parsed),
+    ),
+    20: Solver(
+        day20.Grid.from_string, day20.count_good_2cheats, day20.count_good_20cheats
+    ),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the daily solvers.")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    parser.add_argument(
+        "--input-dir",
+        action="append",
+        type=Path,
+        help="directory containing dayNN*.txt input files (default: inputs)",
+    )
+    parser.add_argument(
+        "--synthetic",
+        action="append",
+        type=float,
+        default=[],
+        metavar="SCALE",
+        help="also run generated inputs SCALE times the size of a real input",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for --synthetic")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per stage")
+    parser.add_argument("--output", type=Path, help="write JSON results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against these results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown against the baseline as a fraction (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    inputs: dict[str, tuple[int, str]] = {}
+    for day in args.days or sorted(SOLVERS):
+        for input_dir in args.input_dir or [Path("inputs")]:
+            for path in sorted(input_dir.glob(f"day{day:02}*.txt")):
+                inputs[str(path)] = (day, path.read_text())
+        if day in GENERATORS:
+            for scale in args.synthetic:
+                label: str = f"synthetic/day{day:02}.x{scale:g}.seed{args.seed}"
+                inputs[label] = (day, generate_scaled(day, scale, seed=args.seed))
+
+    results: Results = {}
+    for label, (day, data) in inputs.items():
+        print(label, file=sys.stderr)
+        results[label] = bench_input(SOLVERS[day], data, repeat=args.repeat)
+        results[label]["day"] = day
+        for stage in STAGES:
+            if stage in results[label]:
+                stats = results[label][stage]
+                print(
+                    f"  {stage:<6} {stats['seconds']:>10.4f}s"
+                    f" {stats['peak_bytes'] / 2**20:>10.2f}MiB",
+                    file=sys.stderr,
+                )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+    if args.baseline:
+        baseline: Results = json.loads(args.baseline.read_text())
+        regressions = find_regressions(baseline, results, threshold=args.threshold)
+        for regression in regressions:
+            print("REGRESSION:", regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+STAGES: tuple[str, ...] = ("parse", "part1", "part2")
+
+
+def bench_input(solver: Solver, data: str, *, repeat: int = 3) -> dict[str, Any]:
+    """
+    Benchmark the stages of one solver on one input.
+
+    Every part gets a freshly parsed input, because some solvers mutate their
+    parsed state. Timings are the best of `repeat` runs, while peak memory is
+    measured on a separate run, since tracing allocations slows everything down.
+    """
+    stages: list[tuple[str, Callable[[Any], Any], bool]] = [
+        ("parse", solver.parse, False),
+        ("part1", solver.part1, True),
+    ]
+    if solver.part2:
+        stages.append(("part2", solver.part2, True))
+
+    results: dict[str, Any] = {}
+    for stage, fn, needs_parsed_input in stages:
+        seconds: list[float] = []
+        answer: Any = None
+        for _ in range(repeat):
+            arg = solver.parse(data) if needs_parsed_input else data
+            start: float = perf_counter()
+            answer = fn(arg)
+            seconds.append(perf_counter() - start)
+
+        arg = solver.parse(data) if needs_parsed_input else data
+        tracemalloc.start()
+        fn(arg)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results[stage] = {"seconds": min(seconds), "peak_bytes": peak_bytes}
+        if needs_parsed_input:
+            results[stage]["answer"] = str(answer)
+
+    return results
+
+
+def find_regressions(
+    baseline: Results, results: Results, *, threshold: float = 0.25
+) -> list[str]:
+    """List stages that got slower than the baseline by more than threshold"""
+    regressions: list[str] = []
+    for label, stages in results.items():
+        for stage in STAGES:
+            if stage not in stages or stage not in baseline.get(label, {}):
+                continue
+            old: float = baseline[label][stage]["seconds"]
+            new: float = stages[stage]["seconds"]
+            if new > old * (1 + threshold):
+                regressions.append(f"{label} {stage}: {old:.4f}s -> {new:.4f}s")
+            old_answer = baseline[label][stage].get("answer")
+            if old_answer is not None and old_answer != stages[stage].get("answer"):
+                regressions.append(f"{label} {stage}: answer changed")
+    return regressions
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Micro-benchmark comparing lib.Point to the frozen dataclass it replaced.
+
+Usage: python3 bench_point.py [-n ITERATIONS]
+"""
+import argparse
+from dataclasses import dataclass
+from timeit import timeit
+
+from lib import Point
+
+
+@dataclass(eq=True, frozen=True)
+class DataclassPoint:
+    x: int
+    y: int
+
+    def __add__(self, rhs: "DataclassPoint") -> "DataclassPoint":
+        return DataclassPoint(x=self.x + rhs.x, y=self.y + rhs.y)
+
+    def __sub__(self, rhs: "DataclassPoint") -> "DataclassPoint":
+        return DataclassPoint(x=self.x - rhs.x, y=self.y - rhs.y)
+
+    def __mul__(self, rhs: int) -> "DataclassPoint":
+        return DataclassPoint(x=self.x * rhs, y=self.y * rhs)
+
+
+OPERATIONS: dict[str, str] = {
+    "construct": "cls(3, 4)",
+    "add": "a + b",
+    "sub": "a - b",
+    "mul": "a * 3",
+    "hash": "hash(a)",
+    "eq": "a == b",
+    "set lookup": "a in s",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("-n", type=int, default=1_000_000, help="iterations per op")
+    args = parser.parse_args()
+
+    print(f"{'operation':<12} {'dataclass':>12} {'Point':>12} {'speedup':>8}")
+    for name, stmt in OPERATIONS.items():
+        timings: list[float] = []
+        for cls in (DataclassPoint, Point):
+            setup = {"cls": cls, "a": cls(3, 4), "b": cls(5, 6)}
+            setup["s"] = {cls(x, y) for x in range(30) for y in range(30)}
+            timings.append(timeit(stmt, globals=setup, number=args.n) / args.n)
+        old, new = timings
+        speedup: float = old / new
+        print(f"{name:<12} {old * 1e9:>10.1f}ns {new * 1e9:>10.1f}ns {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
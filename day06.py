@@ -1,7 +1,10 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from sys import stdin
+from typing import Optional
 
-from lib import Point, orthogonal_directions
+from lib import DenseGrid, Point, clockwise_directions, orthogonal_directions
 
 DIRECTION_MAP: dict[str, Point] = {
     "^": Point.north(),
@@ -21,9 +24,15 @@ Grid = dict[Point, str]
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers", type=int, default=1, help="processes to use for part 2"
+    )
+    args = parser.parse_args()
+
     grid, guard = parse_map(stdin.read())
     print("Part 1:", count_guard_positions(grid, guard))
-    print("Part 2:", count_looping_configurations(grid, guard))
+    print("Part 2:", count_looping_configurations(grid, guard, workers=args.workers))
 
 
 def parse_map(s: str) -> tuple[Grid, Guard]:
@@ -72,26 +81,164 @@ def simulate_guard_route(grid: Grid, guard: Guard) -> tuple[set[Point], Guard]:
     return set(g.position for g in seen), guard
 
 
-def count_looping_configurations(grid: Grid, guard: Guard) -> int:
-    total: int = 0
-
+def count_looping_configurations(grid: Grid, guard: Guard, *, workers: int = 1) -> int:
     # For adding new obstacles, we only need to consider the guard's initial
     # route on the unmodified grid. Any changes outside that route will not
     # change how the guard moves.
-    route, _ = simulate_guard_route(grid, guard)
-
-    distinct_route: set[Point] = route - {guard.position}
-    for p in distinct_route:
-        modified_grid = dict(grid)
-        # Add a new obstacle to a modified grid
-        modified_grid[p] = "#"
-        # And simulate the route on the modified grid
-        _, simulated_guard = simulate_guard_route(modified_grid, guard)
-        # If the guard is still on the grid, they're stuck in a loop
-        if simulated_guard.position in modified_grid:
-            total += 1
-
-    return total
+    jumps = JumpTable(DenseGrid.from_dict(grid))
+    start: int = jumps.grid.index(guard.position)
+    direction: int = CLOCKWISE.index(guard.direction)
+    entries: dict[int, tuple[int, int]] = jumps.route_entries(start, direction)
+
+    # The guard moves exactly like before until it first bumps into the new
+    # obstacle, so each simulation can start from right before that.
+    candidates: list[Candidate] = [
+        (obstacle, position, heading)
+        for obstacle, (position, heading) in entries.items()
+    ]
+    if workers <= 1:
+        return count_loops(jumps, candidates)
+
+    # Every candidate is independent, so they can be split between processes.
+    # The jump table is sent to each worker only once, when the worker starts.
+    chunk_count: int = workers * 4
+    chunks = [candidates[i::chunk_count] for i in range(chunk_count)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(jumps,)
+    ) as executor:
+        return sum(executor.map(count_loops_in_worker, chunks))
+
+
+# extra obstacle, guard position and guard direction right before hitting it
+Candidate = tuple[int, int, int]
+
+
+def count_loops(jumps: "JumpTable", candidates: list[Candidate]) -> int:
+    return sum(
+        1
+        for obstacle, position, heading in candidates
+        if jumps.is_loop(position, heading, obstacle)
+    )
+
+
+# Jump table for the current worker process, set up by init_worker
+worker_jumps: Optional["JumpTable"] = None
+
+
+def init_worker(jumps: "JumpTable") -> None:
+    global worker_jumps
+    worker_jumps = jumps
+
+
+def count_loops_in_worker(candidates: list[Candidate]) -> int:
+    assert worker_jumps, "Worker must be initialized with a jump table"
+    return count_loops(worker_jumps, candidates)
+
+
+# Directions in the order the guard turns through them
+CLOCKWISE: list[Point] = clockwise_directions()
+
+
+class JumpTable:
+    """
+    Lets the guard jump straight from one obstacle to the next.
+
+    For every cell and direction, the table holds the index of the cell where the
+    guard would stop in front of an obstacle, or -1 if the guard would walk off the
+    map. A single extra obstacle is checked for separately, so trying out a new
+    obstacle never requires copying or rebuilding the table.
+    """
+
+    def __init__(self, grid: DenseGrid) -> None:
+        self.grid: DenseGrid = grid
+        self.steps: list[int] = [d.y * grid.width + d.x for d in CLOCKWISE]
+        self.stops: list[list[int]] = [[-1] * len(grid.cells) for _ in CLOCKWISE]
+
+        width, height = grid.width, grid.height
+        columns = [list(range(x, width * height, width)) for x in range(width)]
+        rows = [list(range(y * width, (y + 1) * width)) for y in range(height)]
+        # Sweep every row or column starting from the side the guard is heading
+        # to, so the stop for each cell is known from the last obstacle seen.
+        lanes: list[list[list[int]]] = [
+            columns,
+            [row[::-1] for row in rows],
+            [column[::-1] for column in columns],
+            rows,
+        ]
+        wall: int = ord("#")
+        for stops, step, lane_list in zip(self.stops, self.steps, lanes):
+            for lane in lane_list:
+                stop: int = -1
+                for idx in lane:
+                    if grid.cells[idx] == wall:
+                        stop = idx - step
+                    else:
+                        stops[idx] = stop
+
+    def next_stop(self, position: int, direction: int, obstacle: int) -> int:
+        """Where the guard stops when there's an extra obstacle on the map"""
+        stop: int = self.stops[direction][position]
+        d: Point = CLOCKWISE[direction]
+        p: Point = self.grid.point(position)
+        o: Point = self.grid.point(obstacle)
+
+        # number of steps to the extra obstacle, if it's straight ahead
+        if d.x == 0 and o.x == p.x:
+            distance: int = (o.y - p.y) * d.y
+        elif d.y == 0 and o.y == p.y:
+            distance = (o.x - p.x) * d.x
+        else:
+            return stop
+        if distance <= 0:
+            return stop
+
+        if stop >= 0:
+            s: Point = self.grid.point(stop)
+            if distance > (s.x - p.x) * d.x + (s.y - p.y) * d.y:
+                # the guard turns before reaching the extra obstacle
+                return stop
+
+        return obstacle - self.steps[direction]
+
+    def is_loop(self, position: int, direction: int, obstacle: int) -> bool:
+        seen: set[tuple[int, int]] = set()
+        while True:
+            position = self.next_stop(position, direction, obstacle)
+            if position < 0:
+                # walked off the map
+                return False
+            if (position, direction) in seen:
+                return True
+            seen.add((position, direction))
+            direction = (direction + 1) % len(CLOCKWISE)
+
+    def route_entries(
+        self, position: int, direction: int
+    ) -> dict[int, tuple[int, int]]:
+        """
+        Walk the guard's route on the unmodified map, and for each cell the guard
+        visits, record the guard's position and direction right before first
+        stepping onto it. The starting cell isn't included.
+        """
+        start: int = position
+        entries: dict[int, tuple[int, int]] = {}
+        seen: set[tuple[int, int]] = set()
+        p: Point = self.grid.point(position)
+        while (position, direction) not in seen:
+            seen.add((position, direction))
+            forward: Point = p + CLOCKWISE[direction]
+            if not self.grid.in_bounds(forward):
+                break
+            forward_position: int = self.grid.index(forward)
+            if self.grid.cells[forward_position] == ord("#"):
+                direction = (direction + 1) % len(CLOCKWISE)
+                continue
+            if forward_position not in entries:
+                entries[forward_position] = (position, direction)
+            position, p = forward_position, forward
+
+        entries.pop(start, None)
+        return entries
 
 
 if __name__ == "__main__":
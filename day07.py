@@ -1,4 +1,3 @@
-import operator
 from sys import stdin
 from typing import Callable
 
@@ -29,17 +28,47 @@ def parse_equations(data: str) -> list[Equation]:
 def sum_of_true_equations(
     equations: list[Equation], *, enable_concat: bool = False
 ) -> int:
-    operators: list[Operator] = [operator.add, operator.mul]
-    if enable_concat:
-        operators.append(concat_int)
-
     return sum(
         target_value
         for target_value, numbers in equations
-        if check_equation(target_value, numbers[0], numbers[1:], operators)
+        if check_equation_backwards(target_value, numbers, enable_concat=enable_concat)
     )
 
 
+def check_equation_backwards(
+    target_value: int, numbers: list[int], *, enable_concat: bool = False
+) -> bool:
+    """
+    Check whether some operators combine the numbers into the target.
+
+    Works from the last number back to the first, undoing each operator: the
+    target must be at least the number to undo an addition, divisible by it to
+    undo a multiplication, and end in its digits to undo a concatenation. Most
+    branches fail one of those tests right away, so even long lines are cheap.
+    All numbers are assumed to be non-negative, like in the puzzle input.
+    """
+
+    def solve(value: int, idx: int) -> bool:
+        number: int = numbers[idx]
+        if idx == 0:
+            return value == number
+        if value >= number and solve(value - number, idx - 1):
+            return True
+        if number == 0:
+            # multiplying by zero gives zero no matter what came before
+            if value == 0:
+                return True
+        elif value % number == 0 and solve(value // number, idx - 1):
+            return True
+        if enable_concat:
+            power: int = power_of_ten_above(number)
+            if value % power == number and solve(value // power, idx - 1):
+                return True
+        return False
+
+    return solve(target_value, len(numbers) - 1)
+
+
 def check_equation(
     target_value: int,
     intermediate_result: int,
@@ -58,7 +87,15 @@ def check_equation(
 
 
 def concat_int(a: int, b: int) -> int:
-    return int(str(a) + str(b))
+    return a * power_of_ten_above(b) + b
+
+
+def power_of_ten_above(n: int) -> int:
+    """Smallest power of ten above n, i.e. 10 to the number of digits of n"""
+    power: int = 10
+    while power <= n:
+        power *= 10
+    return power
 
 
 if __name__ == "__main__":
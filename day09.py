@@ -1,15 +1,32 @@
+import argparse
+import mmap
+import os
+from array import array
+from collections import defaultdict
 from dataclasses import dataclass
+from heapq import heappop, heappush
 from itertools import count, cycle
 from sys import stdin
-from typing import Iterable
+from typing import Sequence
 
 from lib import each_twice
 
 
+# maps ASCII digits to their values
+DIGIT_VALUES: bytes = bytes.maketrans(b"0123456789", bytes(range(10)))
+CHUNK_SIZE: int = 2**20
+
+
 def main() -> None:
-    diskmap = DiskMap.from_string(stdin.read())
-    print("Part 1:", checksum(diskmap))
-    print("Part 2:", checksum2(diskmap))
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "path", nargs="?", help="memory-map the disk map from this file, not stdin"
+    )
+    args = parser.parse_args()
+
+    lengths = read_lengths(args.path) if args.path else parse_lengths(stdin.read())
+    print("Part 1:", compact_checksum(lengths))
+    print("Part 2:", whole_file_checksum(lengths))
 
 
 @dataclass
@@ -73,55 +90,219 @@ class DiskMap:
                 right_bucket.file_counts.append((last_file_id, overflow))
 
     def defrag_whole_files(self) -> None:
+        """
+        Move each whole file, highest file id first, to the leftmost gap that fits
+        it.
+
+        Gaps only ever shrink, so they're kept in one min-heap of bucket indices
+        per gap size. The leftmost fitting gap is the smallest index at the top of
+        the heaps for sizes large enough for the file.
+        """
+        gaps: dict[int, list[int]] = defaultdict(list)
+        for idx, bucket in enumerate(self.bucket_list):
+            if bucket.empty_blocks > 0:
+                heappush(gaps[bucket.empty_blocks], idx)
+
+        max_gap: int = max(gaps, default=0)
         for idx, right_bucket in reversed(list(enumerate(self.bucket_list))):
             if not right_bucket.file_counts:
                 continue
 
             last_file_id, last_file_count = right_bucket.file_counts[-1]
-            for left in range(0, idx):
-                left_bucket = self.bucket_list[left]
+            candidates: list[tuple[int, int]] = [
+                (gaps[size][0], size)
+                for size in range(last_file_count, max_gap + 1)
+                if gaps[size]
+            ]
+            if not candidates:
+                continue
+            left, gap_size = min(candidates)
+            if left >= idx:
+                # files only move to the left
+                continue
+
+            # move the file from right to left
+            heappop(gaps[gap_size])
+            left_bucket = self.bucket_list[left]
+            right_bucket.file_counts.pop()
+            right_bucket.empty_blocks += last_file_count
+            left_bucket.file_counts.append((last_file_id, last_file_count))
+            left_bucket.empty_blocks -= last_file_count
+            if left_bucket.empty_blocks > 0:
+                heappush(gaps[left_bucket.empty_blocks], left)
+
 
-                # move files from right to left if they fit
-                if last_file_count <= left_bucket.empty_blocks:
-                    right_bucket.file_counts.pop()
-                    right_bucket.empty_blocks += last_file_count
-                    left_bucket.file_counts.append((last_file_id, last_file_count))
-                    left_bucket.empty_blocks -= last_file_count
-                    break
+def run_checksum(position: int, file_id: int, length: int) -> int:
+    """Checksum of `length` blocks of one file starting at `position`"""
+    # position + (position + 1) + ... + (position + length - 1)
+    return file_id * (length * position + length * (length - 1) // 2)
 
 
-def bucket_rle_iter(bucket: Bucket) -> Iterable[int]:
-    for file_id, file_count in bucket.file_counts:
-        for _ in range(file_count):
-            yield file_id
-    for _ in range(bucket.empty_blocks):
-        yield 0
+def bucket_list_checksum(bucket_list: list[Bucket]) -> int:
+    total: int = 0
+    position: int = 0
+    for bucket in bucket_list:
+        for file_id, file_count in bucket.file_counts:
+            total += run_checksum(position, file_id, file_count)
+            position += file_count
+        position += bucket.empty_blocks
+    return total
 
 
 def checksum(diskmap: DiskMap) -> int:
     diskmap = diskmap.copy()
     diskmap.defrag()
-    return sum(
-        block_number * file_id
-        for block_number, file_id in enumerate(
-            file_id
-            for bucket in diskmap.bucket_list
-            for file_id in bucket_rle_iter(bucket)
-        )
-    )
+    return bucket_list_checksum(diskmap.bucket_list)
 
 
 def checksum2(diskmap: DiskMap) -> int:
     diskmap = diskmap.copy()
     diskmap.defrag_whole_files()
-    return sum(
-        block_number * file_id
-        for block_number, file_id in enumerate(
-            file_id
-            for bucket in diskmap.bucket_list
-            for file_id in bucket_rle_iter(bucket)
+    return bucket_list_checksum(diskmap.bucket_list)
+
+
+def parse_lengths(data: str) -> "array[int]":
+    return array("B", data.strip().encode().translate(DIGIT_VALUES))
+
+
+def read_lengths(path: str) -> "array[int]":
+    """
+    Read the digits of a disk map file into an array of one byte per digit.
+
+    The file is memory-mapped and converted a chunk at a time, so huge disk maps
+    never exist as a string or a list of ints.
+    """
+    lengths: "array[int]" = array("B")
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return lengths
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), CHUNK_SIZE):
+                chunk: bytes = mm[start : start + CHUNK_SIZE]
+                lengths.frombytes(chunk.translate(DIGIT_VALUES, b" \t\r\n"))
+    return lengths
+
+
+def compact_checksum(lengths: Sequence[int]) -> int:
+    """
+    Checksum after moving file blocks one at a time into the leftmost free space.
+
+    Works directly on the digits of the disk map: a left pointer walks forward
+    through files and gaps, and each gap is filled from a right pointer walking
+    backwards through the files. Runs of blocks are summed up with a closed
+    formula, so the cost only depends on the number of digits.
+    """
+    total: int = 0
+    position: int = 0
+    # digits at even indices are files
+    right: int = len(lengths) - 1
+    right -= right % 2
+    right_remaining: int = lengths[right] if right >= 0 else 0
+
+    left: int = 0
+    while left < right:
+        if left % 2 == 0:
+            total += run_checksum(position, left // 2, lengths[left])
+            position += lengths[left]
+        else:
+            gap: int = lengths[left]
+            while gap > 0 and right > left:
+                moved: int = min(gap, right_remaining)
+                total += run_checksum(position, right // 2, moved)
+                position += moved
+                gap -= moved
+                right_remaining -= moved
+                if right_remaining == 0:
+                    right -= 2
+                    right_remaining = lengths[right] if right > left else 0
+        left += 1
+
+    if left == right:
+        # the last file may have been partially moved already
+        total += run_checksum(position, right // 2, right_remaining)
+    return total
+
+
+def whole_file_checksum(lengths: Sequence[int]) -> int:
+    """
+    Checksum after moving whole files, highest file id first, to the leftmost gap
+    that fits them.
+
+    Works like DiskMap.defrag_whole_files, but directly on the digits of the disk
+    map, and each file adds its checksum with a closed formula wherever it ends up.
+    """
+    gaps = GapIndex()
+    position: int = 0
+    for idx, length in enumerate(lengths):
+        if idx % 2 == 1 and length > 0:
+            gaps.add(length, position)
+        position += length
+
+    total: int = 0
+    # walk back from the end of the disk, so positions are known without storing
+    # an offset for every digit
+    for idx in reversed(range(len(lengths))):
+        length = lengths[idx]
+        position -= length
+        if idx % 2 == 1:
+            continue
+
+        gap_position, gap_size = min(
+            ((gaps.leftmost(size), size) for size in range(length, gaps.max_size + 1)),
+            default=(GapIndex.NO_GAP, 0),
         )
-    )
+        if gap_position < position:
+            # move the file to the left
+            gaps.pop(gap_size)
+            if gap_size > length:
+                gaps.push(gap_size - length, gap_position + length)
+            total += run_checksum(gap_position, idx // 2, length)
+        else:
+            total += run_checksum(position, idx // 2, length)
+    return total
+
+
+class GapIndex:
+    """
+    Start positions of free gaps, grouped by gap size.
+
+    Gaps from the original disk map are added from left to right and stored in
+    compact arrays, so the leftmost unused gap of each size is simply the next
+    entry. Space left over after moving a file into a bigger gap goes into a small
+    min-heap for its new size.
+    """
+
+    NO_GAP: int = 2**63
+
+    def __init__(self) -> None:
+        self.starts: dict[int, "array[int]"] = defaultdict(lambda: array("q"))
+        self.used: dict[int, int] = defaultdict(int)
+        self.leftovers: dict[int, list[int]] = defaultdict(list)
+        self.max_size: int = 0
+
+    def add(self, size: int, position: int) -> None:
+        self.starts[size].append(position)
+        self.max_size = max(self.max_size, size)
+
+    def push(self, size: int, position: int) -> None:
+        heappush(self.leftovers[size], position)
+
+    def leftmost(self, size: int) -> int:
+        starts: "array[int]" = self.starts[size]
+        used: int = self.used[size]
+        leftovers: list[int] = self.leftovers[size]
+        return min(
+            starts[used] if used < len(starts) else self.NO_GAP,
+            leftovers[0] if leftovers else self.NO_GAP,
+        )
+
+    def pop(self, size: int) -> int:
+        position: int = self.leftmost(size)
+        if self.leftovers[size] and self.leftovers[size][0] == position:
+            heappop(self.leftovers[size])
+        else:
+            self.used[size] += 1
+        return position
 
 
 if __name__ == "__main__":
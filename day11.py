@@ -1,39 +1,232 @@
-from functools import cache
+import argparse
+from collections import Counter
+from sys import stdin
+from typing import Iterable, Optional
+
+from lib import MemoCache, repeat_call
 
 
 def main() -> None:
-    stones: list[int] = [965842, 9159, 3372473, 311, 0, 6, 86213, 48]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?", help="read stones from this file, not stdin")
+    parser.add_argument(
+        "--distinct",
+        action="store_true",
+        help="print the number of distinct stone values after each blink",
+    )
+    args = parser.parse_args()
+
+    if args.path:
+        with open(args.path) as f:
+            stones: list[int] = parse_stones(f.read())
+    else:
+        stones = parse_stones(stdin.read())
+
     print("Part 1:", blink(stones, n=25))
     print("Part 2:", blink(stones, n=75))
 
+    if args.distinct:
+        for n, counts in enumerate(blink_history(stones, n=75), start=1):
+            print(f"Blink {n}: {sum(counts.values())} stones, {len(counts)} distinct")
+
+
+def parse_stones(data: str) -> list[int]:
+    return [int(n) for n in data.split()]
+
 
 def blink(stones: list[int], *, n: int = 1) -> int:
-    return sum(blink_impl(stone, n=n) for stone in stones)
+    return sum(blink_counts(stones, n=n).values())
 
 
-@cache
-def blink_impl(stone: int, *, n: int) -> int:
-    if n == 0:
-        return 1
+def blink_counts(stones: Iterable[int], *, n: int) -> Counter[int]:
+    """
+    Count the stones of each value after n blinks.
+
+    Stones with the same number always change the same way, so it's enough to
+    keep track of how many stones there are of each value. The number of distinct
+    values stays small, so each blink is cheap no matter how large n gets.
+    """
+    return repeat_call(evolve, Counter(stones), n=n)
+
 
+def blink_history(stones: Iterable[int], *, n: int) -> Iterable[Counter[int]]:
+    """Iterate over the stone counts after each of n blinks"""
+    counts: Counter[int] = Counter(stones)
+    for _ in range(n):
+        counts = evolve(counts)
+        yield counts
+
+
+def evolve(counts: Counter[int]) -> Counter[int]:
+    """Blink once"""
+    next_counts: Counter[int] = Counter()
+    for stone, count in counts.items():
+        for next_stone in next_stones(stone):
+            next_counts[next_stone] += count
+    return next_counts
+
+
+def next_stones(stone: int) -> tuple[int, ...]:
     # If the stone is engraved with the number 0, it is replaced by a stone
     # engraved with the number 1.
     if stone == 0:
-        return blink_impl(1, n=n - 1)
+        return (1,)
     # If the stone is engraved with a number that has an even number of digits, it
     # is replaced by two stones. The left half of the digits are engraved on the
     # new left stone, and the right half of the digits are engraved on the new
     # right stone. (The new numbers don't keep extra leading zeroes: 1000 would
     # become stones 10 and 0.)
-    elif len(stone_string := str(stone)) % 2 == 0:
-        mid: int = len(stone_string) // 2
-        left_stone: int = int(stone_string[:mid])
-        right_stone: int = int(stone_string[mid:])
-        return blink_impl(left_stone, n=n - 1) + blink_impl(right_stone, n=n - 1)
+    digits: int = digit_count(stone)
+    if digits % 2 == 0:
+        return divmod(stone, 10 ** (digits // 2))
     # If none of the other rules apply, the stone is replaced by a new stone; the
     # old stone's number multiplied by 2024 is engraved on the new stone.
+    return (stone * 2024,)
+
+
+def digit_count(n: int) -> int:
+    digits: int = 1
+    while n >= 10:
+        n //= 10
+        digits += 1
+    return digits
+
+
+# transition matrix rows: for each value, how many stones of each value it turns
+# into, both given as indices into the list of values
+SparseMatrix = list[dict[int, int]]
+
+
+def blink_power(
+    stones: Iterable[int],
+    *,
+    n: int,
+    modulus: Optional[int] = None,
+    use_numpy: bool = False,
+) -> int:
+    """
+    Count the stones after n blinks in O(log n) matrix multiplications.
+
+    Only a few thousand different values can ever show up, so a blink is a linear
+    map over the counts of those values. Raising its matrix to the nth power by
+    repeated squaring gives the counts after n blinks. For huge n the counts get
+    astronomically large, so they can be reduced modulo `modulus`.
+
+    The pure Python backend uses sparse matrices, which is only practical when
+    few distinct values are reachable. The numpy backend needs a modulus below
+    2**31 and handles the few thousand values of real puzzle inputs.
+    """
+    counts: Counter[int] = Counter(stones)
+    values: list[int] = closed_values(counts)
+    index: dict[int, int] = {value: idx for idx, value in enumerate(values)}
+    matrix: SparseMatrix = [{} for _ in values]
+    for value in values:
+        for next_stone in next_stones(value):
+            row = matrix[index[next_stone]]
+            row[index[value]] = row.get(index[value], 0) + 1
+    vector: list[int] = [counts[value] for value in values]
+
+    if use_numpy:
+        assert modulus and modulus < 2**31, "numpy backend needs a modulus < 2**31"
+        total: int = numpy_matrix_power_total(matrix, vector, n=n, modulus=modulus)
     else:
-        return blink_impl(stone * 2024, n=n - 1)
+        total = sparse_matrix_power_total(matrix, vector, n=n, modulus=modulus)
+    return total % modulus if modulus else total
+
+
+def closed_values(stones: Iterable[int]) -> list[int]:
+    """List every value that can appear when starting from the given stones"""
+    seen: set[int] = set(stones)
+    to_check: list[int] = list(seen)
+    while to_check:
+        for next_stone in next_stones(to_check.pop()):
+            if next_stone not in seen:
+                seen.add(next_stone)
+                to_check.append(next_stone)
+    return sorted(seen)
+
+
+def sparse_matrix_power_total(
+    matrix: SparseMatrix, vector: list[int], *, n: int, modulus: Optional[int]
+) -> int:
+    def reduce(value: int) -> int:
+        return value % modulus if modulus else value
+
+    def multiply(a: SparseMatrix, b: SparseMatrix) -> SparseMatrix:
+        product: SparseMatrix = [{} for _ in a]
+        for row, product_row in zip(a, product):
+            for k, a_value in row.items():
+                for j, b_value in b[k].items():
+                    product_row[j] = reduce(product_row.get(j, 0) + a_value * b_value)
+        return product
+
+    def apply(a: SparseMatrix, v: list[int]) -> list[int]:
+        return [reduce(sum(value * v[k] for k, value in row.items())) for row in a]
+
+    # square-and-multiply; powers of the same matrix commute, so the order in
+    # which they're applied to the vector doesn't matter
+    while n:
+        if n & 1:
+            vector = apply(matrix, vector)
+        n >>= 1
+        if n:
+            matrix = multiply(matrix, matrix)
+    return sum(vector)
+
+
+def numpy_matrix_power_total(
+    matrix: SparseMatrix, vector: list[int], *, n: int, modulus: int
+) -> int:
+    # Hack: import numpy here to avoid bringing it as a dependency for unit tests
+    import numpy as np
+
+    def multiply(a, b):
+        # Split every entry into 16 bit halves, so that all partial sums stay
+        # exact in float64 and can use the fast floating point matrix product.
+        a_low, a_high = (a & 0xFFFF).astype(np.float64), (a >> 16).astype(np.float64)
+        b_low, b_high = (b & 0xFFFF).astype(np.float64), (b >> 16).astype(np.float64)
+        low = a_low @ b_low
+        high = a_high @ b_high
+        middle = (a_low + a_high) @ (b_low + b_high) - low - high
+        product = high.astype(np.int64) % modulus
+        product = (product * 0x10000 + middle.astype(np.int64)) % modulus
+        return (product * 0x10000 + low.astype(np.int64)) % modulus
+
+    dense = np.zeros((len(matrix), len(matrix)), dtype=np.int64)
+    for i, row in enumerate(matrix):
+        for j, value in row.items():
+            dense[i, j] = value
+    column = np.array(vector, dtype=np.int64).reshape(-1, 1) % modulus
+
+    while n:
+        if n & 1:
+            column = multiply(dense, column)
+        n >>= 1
+        if n:
+            dense = multiply(dense, dense)
+    return int(column.sum() % modulus)
+
+
+def blink_impl(
+    stone: int, *, n: int, memo: Optional[MemoCache[tuple[int, int], int]] = None
+) -> int:
+    """
+    Count the stones a single stone turns into after n blinks, recursively.
+
+    Results are memoized in `memo`, which can be shared between calls for the
+    same job. Without one, a fresh cache lives only as long as the call.
+    """
+    if n == 0:
+        return 1
+    if memo is None:
+        memo = MemoCache()
+    count: Optional[int] = memo.get((stone, n))
+    if count is None:
+        count = memo.put(
+            (stone, n),
+            sum(blink_impl(s, n=n - 1, memo=memo) for s in next_stones(stone)),
+        )
+    return count
 
 
 if __name__ == "__main__":
@@ -1,10 +1,8 @@
-from collections import defaultdict
 from dataclasses import dataclass
-from heapq import heappop, heappush
 from sys import stdin
 from typing import Optional
 
-from lib import Point, orthogonal_directions
+from lib import UNREACHED, DenseGrid, Point, clockwise_directions, heading_distances
 
 DEFAULT_HEADING = Point.east()
 
@@ -41,129 +39,51 @@ class Maze:
         assert end, "Input must include an end point"
         return Maze(maze=maze, start=start, end=end)
 
+    def to_grid(self) -> DenseGrid:
+        width: int = max(p.x for p in self.maze) + 1
+        height: int = max(p.y for p in self.maze) + 1
+        return DenseGrid.from_points(self.maze, width, height, ch=".", fill="#")
+
 
 def best_score(maze: Maze) -> int:
-    costs = build_cost_matrix(maze)
-    return costs[maze.end]
+    grid = maze.to_grid()
+    forward = heading_distances(
+        grid, [start_state(maze, grid)], targets=end_states(maze, grid)
+    )
+    return min(forward[state] for state in end_states(maze, grid))
 
 
 def best_path_tiles(maze: Maze) -> int:
-    costs = build_cost_matrix(maze)
-    path = find_alternative_paths(maze, costs)
-    return len(path)
-
-
-# cost, position, heading
-QueueItem = tuple[int, Point, Point]
-
-
-def build_cost_matrix(maze: Maze) -> dict[Point, int]:
     """
-    Find the best path from start to end and return the resulting cost matrix.
+    Count the tiles on any of the best paths.
 
-    It's just a dijktsra with some custom cost stuff.
+    A state lies on a best path exactly when its distance from the start plus its
+    distance to the end equals the best score, so one search from each end and a
+    single pass over the states is enough.
     """
-    start: Point = maze.start
-    end: Point = maze.end
-
-    # set up djikstra priority queue
-    queue: list[QueueItem] = []
-    heappush(queue, (0, start, DEFAULT_HEADING))
-
-    # set up cost matrix
-    path_costs: dict[Point, int] = defaultdict(lambda: 2**32)
-    path_costs[start] = 0
+    grid = maze.to_grid()
+    start: int = start_state(maze, grid)
+    ends: list[int] = end_states(maze, grid)
+    forward = heading_distances(grid, [start], targets=ends)
+    backward = heading_distances(grid, ends, targets=[start], reverse=True)
+    best: int = min(forward[state] for state in ends)
+    assert best < UNREACHED, "Maze must be solvable"
 
-    # keep track of how we got to each node
-    prev: dict[Point, set[Point]] = defaultdict(set)
+    return len(
+        set(
+            state // 4
+            for state, (to_state, from_state) in enumerate(zip(forward, backward))
+            if to_state + from_state == best
+        )
+    )
 
-    while queue:
-        cost, pos, heading = heappop(queue)
-        if pos == end:
-            break
 
-        for direction in orthogonal_directions():
-            if direction == heading.reverse():
-                # no backtracking
-                continue
+def start_state(maze: Maze, grid: DenseGrid) -> int:
+    return grid.index(maze.start) * 4 + clockwise_directions().index(DEFAULT_HEADING)
 
-            next_pos: Point = pos + direction
-            if next_pos not in maze.maze:
-                # no wallhacks
-                continue
 
-            cost_to_move: int = 1 if direction == heading else 1001
-            cost_to_destination: int = cost + cost_to_move
-            if cost_to_destination >= path_costs[next_pos]:
-                # we've already found a cheaper route to this tile
-                continue
-
-            prev[next_pos].add(pos)
-            path_costs[next_pos] = cost_to_destination
-            heappush(queue, (cost_to_destination, next_pos, direction))
-
-    assert end in prev, "Maze must be solvable"
-    return path_costs
-
-
-def find_alternative_paths(maze: Maze, old_costs: dict[Point, int]) -> set[Point]:
-    """
-    Finds all equally good alternative paths for a solved maze.
-
-    Also just a dijktsra with some custom cost stuff.
-    """
-    start: Point = maze.end
-    end: Point = maze.start
-
-    # set up djikstra priority queue
-    queue: list[QueueItem] = []
-    for direction in orthogonal_directions():
-        heappush(queue, (0, start, direction))
-
-    # set up cost matrix
-    path_costs: dict[Point, int] = defaultdict(lambda: 2**32)
-    path_costs[start] = 0
-
-    # keep track of how we got to each node
-    prev: dict[Point, set[Point]] = defaultdict(set)
-
-    while queue:
-        cost, pos, heading = heappop(queue)
-        if pos == end:
-            break
-
-        for direction in orthogonal_directions():
-            if direction == heading.reverse():
-                # no backtracking
-                continue
-
-            next_pos: Point = pos + direction
-            if next_pos not in maze.maze:
-                # no wallhacks
-                continue
-
-            cost_to_move: int = 1 if direction == heading else 1001
-            cost_to_destination: int = cost + cost_to_move
-            if cost_to_destination + old_costs[next_pos] > old_costs[start]:
-                # going to next_pos would be more expensive than the optimal route
-                continue
-
-            prev[next_pos].add(pos)
-            path_costs[next_pos] = cost_to_destination
-            heappush(queue, (cost_to_destination, next_pos, direction))
-
-    assert end in prev, "Maze must be solvable"
-    return make_paths(prev, end)
-
-
-def make_paths(prev: dict[Point, set[Point]], tgt: Point) -> set[Point]:
-    paths: set[Point] = set()
-    to_check: list[Point] = [tgt]
-    while to_check:
-        current = to_check.pop()
-        paths.add(current)
-        to_check.extend(prev[current])
-    return paths
+def end_states(maze: Maze, grid: DenseGrid) -> list[int]:
+    return [grid.index(maze.end) * 4 + heading for heading in range(4)]
 
 
 if __name__ == "__main__":
@@ -1,9 +1,17 @@
-from collections import defaultdict
+from collections import deque
 from dataclasses import dataclass
 from heapq import heappop, heappush
 from sys import stdin
+from typing import Callable, Optional
 
-from lib import Point, orthogonal_neighborhood
+from lib import (
+    DenseGrid,
+    Point,
+    UnionFind,
+    manhattan_distance,
+    neighborhood,
+    orthogonal_neighborhood,
+)
 
 
 def main() -> None:
@@ -41,6 +49,56 @@ def shortest_path_length(grid: Grid) -> int:
 
 
 def first_blocking_coordinate(grid: Grid) -> Point:
+    """
+    Find the first byte that cuts off the goal from the start.
+
+    Bytes are removed from the fully fallen grid in reverse order while joining
+    the freed cells to their open neighbors in a union-find. The first byte that
+    connects the start to the goal when removed is the one that blocked the path.
+    """
+    width: int = grid.goal.x + 1
+    height: int = grid.goal.y + 1
+    start: int = 0
+    goal: int = grid.goal.y * width + grid.goal.x
+
+    # A cell opens up only when the earliest byte that landed on it is removed
+    first_fall: dict[Point, int] = {}
+    for idx, p in enumerate(grid.incoming):
+        first_fall.setdefault(p, idx)
+
+    is_open: bytearray = bytearray([1]) * (width * height)
+    for p in first_fall:
+        is_open[p.y * width + p.x] = 0
+
+    sets = UnionFind(width * height)
+
+    def open_cell(p: Point) -> None:
+        idx: int = p.y * width + p.x
+        is_open[idx] = 1
+        for neighbor in orthogonal_neighborhood(p):
+            if grid.in_bounds(neighbor) and is_open[neighbor.y * width + neighbor.x]:
+                sets.union(idx, neighbor.y * width + neighbor.x)
+
+    for y in range(height):
+        for x in range(width):
+            if is_open[y * width + x]:
+                open_cell(Point(x, y))
+
+    assert not sets.connected(start, goal), "Bytes must block the path eventually"
+
+    for idx in reversed(range(len(grid.incoming))):
+        p: Point = grid.incoming[idx]
+        if first_fall[p] != idx:
+            continue
+        open_cell(p)
+        if is_open[start] and is_open[goal] and sets.connected(start, goal):
+            return p
+
+    raise AssertionError("Path must be open before any bytes fall")
+
+
+def first_blocking_coordinate_bisect(grid: Grid) -> Point:
+    """Find the first blocking byte by binary searching with path finding"""
     left: int = 0
     right: int = len(grid.incoming)
     mid: int = len(grid.incoming) // 2
@@ -56,55 +114,188 @@ def first_blocking_coordinate(grid: Grid) -> Point:
     return grid.incoming[mid]
 
 
-# cost, position
-QueueItem = tuple[int, Point]
+class BlockageMonitor:
+    """
+    Keeps track of whether the goal can still be reached while bytes keep falling.
+
+    The path from the top left corner to the bottom right corner is blocked
+    exactly when fallen bytes form a chain, touching diagonally or orthogonally,
+    from the bottom or left edge to the top or right edge. Bytes only ever get
+    added, so a union-find over the fallen bytes answers this for each new byte
+    in near constant time.
+    """
+
+    def __init__(self, goal: Point) -> None:
+        self.goal: Point = goal
+        self.width: int = goal.x + 1
+        cell_count: int = self.width * (goal.y + 1)
+        # two extra nodes for the bottom/left edges and the top/right edges
+        self.bottom_left: int = cell_count
+        self.top_right: int = cell_count + 1
+        self.sets = UnionFind(cell_count + 2)
+        self.fallen: bytearray = bytearray(cell_count)
+        self.blocked: bool = False
+
+    def add_byte(self, p: Point) -> bool:
+        """Add a fallen byte and return True if the goal can still be reached"""
+        idx: int = p.y * self.width + p.x
+        self.fallen[idx] = 1
+        if p.x == 0 or p.y == self.goal.y:
+            self.sets.union(idx, self.bottom_left)
+        if p.y == 0 or p.x == self.goal.x:
+            self.sets.union(idx, self.top_right)
+        for neighbor in neighborhood(p):
+            if (
+                0 <= neighbor.x <= self.goal.x
+                and 0 <= neighbor.y <= self.goal.y
+                and self.fallen[neighbor.y * self.width + neighbor.x]
+            ):
+                self.sets.union(idx, neighbor.y * self.width + neighbor.x)
+
+        self.blocked = (
+            self.blocked
+            or p in (Point(0, 0), self.goal)
+            or self.sets.connected(self.bottom_left, self.top_right)
+        )
+        return not self.blocked
 
 
-def shortest_path(grid: Grid) -> set[Point]:
+def first_blocking_coordinate_online(grid: Grid) -> Point:
+    monitor = BlockageMonitor(grid.goal)
+    return next(p for p in grid.incoming if not monitor.add_byte(p))
+
+
+# Finds a path on a grid from start to goal, given as flat cell indices. Returns
+# the cells on the path, including start and goal, or an empty list.
+SearchFunction = Callable[[DenseGrid, int, int], list[int]]
+
+WALL: int = ord("#")
+
+
+def shortest_path(grid: Grid, *, search: Optional[SearchFunction] = None) -> set[Point]:
     """
-    Find the best path from start to end.
+    Find the best path from start to end. The start is not included in the path.
 
-    It's just a dijktsra with some custom cost stuff.
+    All steps cost the same, so a breadth-first search is enough by default.
     """
-    start: Point = Point(0, 0)
-    end: Point = grid.goal
+    dense = DenseGrid.from_points(
+        (p for p in grid.walls if grid.in_bounds(p)), grid.goal.x + 1, grid.goal.y + 1
+    )
+    start: int = dense.index(Point(0, 0))
+    end: int = dense.index(grid.goal)
+    path: list[int] = (search or bfs_search)(dense, start, end)
+    return set(dense.point(idx) for idx in path[1:])
 
-    # set up djikstra priority queue
-    queue: list[QueueItem] = []
-    heappush(queue, (0, start))
 
-    # set up cost matrix
-    path_costs: dict[Point, int] = defaultdict(lambda: 2**32)
-    path_costs[start] = 0
+def trace_path(prev: list[int], end: int) -> list[int]:
+    """Follow the previous cell links back from end, which must have been reached"""
+    path: list[int] = [end]
+    while prev[path[-1]] != path[-1]:
+        path.append(prev[path[-1]])
+    return path[::-1]
 
-    # keep track of how we got to each node
-    prev: dict[Point, Point] = {}
 
+def bfs_search(dense: DenseGrid, start: int, end: int) -> list[int]:
+    if dense.cells[start] == WALL or dense.cells[end] == WALL:
+        return []
+
+    # previous cell on the way to each cell, -1 for unvisited cells
+    prev: list[int] = [-1] * len(dense.cells)
+    prev[start] = start
+    queue: deque[int] = deque([start])
     while queue:
-        cost, pos = heappop(queue)
-        if pos == end:
-            break
+        idx = queue.popleft()
+        if idx == end:
+            return trace_path(prev, end)
+        for neighbor in dense.neighbors(idx):
+            if prev[neighbor] < 0 and dense.cells[neighbor] != WALL:
+                prev[neighbor] = idx
+                queue.append(neighbor)
+    return []
 
-        for next_pos in orthogonal_neighborhood(pos):
-            if next_pos in grid.walls or not grid.in_bounds(next_pos):
-                # this way is blocked
-                continue
 
-            cost_to_destination: int = cost + 1
-            if cost_to_destination >= path_costs[next_pos]:
-                # we've already found a cheaper route to this tile
+def astar_search(dense: DenseGrid, start: int, end: int) -> list[int]:
+    if dense.cells[start] == WALL or dense.cells[end] == WALL:
+        return []
+
+    goal: Point = dense.point(end)
+
+    def heuristic(idx: int) -> int:
+        return manhattan_distance(dense.point(idx), goal)
+
+    prev: list[int] = [-1] * len(dense.cells)
+    prev[start] = start
+    cost: list[int] = [len(dense.cells)] * len(dense.cells)
+    cost[start] = 0
+    # estimated total cost, cost so far, cell
+    queue: list[tuple[int, int, int]] = [(heuristic(start), 0, start)]
+    while queue:
+        _, steps, idx = heappop(queue)
+        if idx == end:
+            return trace_path(prev, end)
+        if steps > cost[idx]:
+            # stale queue entry, a cheaper route was found since
+            continue
+        for neighbor in dense.neighbors(idx):
+            if dense.cells[neighbor] == WALL or steps + 1 >= cost[neighbor]:
                 continue
+            prev[neighbor] = idx
+            cost[neighbor] = steps + 1
+            heappush(queue, (steps + 1 + heuristic(neighbor), steps + 1, neighbor))
+    return []
+
+
+def bidirectional_search(dense: DenseGrid, start: int, end: int) -> list[int]:
+    """
+    Breadth-first search from both ends at once, one layer at a time, until the
+    searches meet. This visits far fewer cells than a one-sided search on open
+    grids.
+    """
+    if dense.cells[start] == WALL or dense.cells[end] == WALL:
+        return []
+    if start == end:
+        return [start]
+
+    prev_forward: list[int] = [-1] * len(dense.cells)
+    prev_forward[start] = start
+    prev_backward: list[int] = [-1] * len(dense.cells)
+    prev_backward[end] = end
+    forward: list[int] = [start]
+    backward: list[int] = [end]
+
+    while forward and backward:
+        # always expand the smaller frontier
+        swapped: bool = len(forward) > len(backward)
+        if swapped:
+            forward, backward = backward, forward
+            prev_forward, prev_backward = prev_backward, prev_forward
+
+        next_layer: list[int] = []
+        meeting_point: int = -1
+        for idx in forward:
+            for neighbor in dense.neighbors(idx):
+                if prev_forward[neighbor] >= 0 or dense.cells[neighbor] == WALL:
+                    continue
+                prev_forward[neighbor] = idx
+                if prev_backward[neighbor] >= 0:
+                    meeting_point = neighbor
+                    break
+                next_layer.append(neighbor)
+            if meeting_point >= 0:
+                break
+        forward = next_layer
+
+        if swapped:
+            forward, backward = backward, forward
+            prev_forward, prev_backward = prev_backward, prev_forward
 
-            prev[next_pos] = pos
-            path_costs[next_pos] = cost_to_destination
-            heappush(queue, (cost_to_destination, next_pos))
+        if meeting_point >= 0:
+            return (
+                trace_path(prev_forward, meeting_point)
+                + trace_path(prev_backward, meeting_point)[::-1][1:]
+            )
 
-    current: Point = end
-    path: set[Point] = set()
-    while current in prev:
-        path.add(current)
-        current = prev[current]
-    return path
+    return []
 
 
 if __name__ == "__main__":
@@ -1,11 +1,31 @@
-from functools import cache
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
 from sys import stdin
+from typing import Iterable, Iterator, Optional
+
+from lib import MemoCache
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1, help="processes to use")
+    args = parser.parse_args()
+
     patterns, towels = parse_towels(stdin.read())
-    print("Part 1:", count_possible_designs(patterns, towels))
-    print("Part 2:", count_possible_arrangements(patterns, towels))
+    if args.workers <= 1:
+        print("Part 1:", count_possible_designs(patterns, towels))
+        print("Part 2:", count_possible_arrangements(patterns, towels))
+        return
+
+    counts: list[int] = [
+        count
+        for _, count in count_arrangements_parallel(
+            patterns, towels, workers=args.workers
+        )
+    ]
+    print("Part 1:", sum(1 for count in counts if count >= 1))
+    print("Part 2:", sum(counts))
 
 
 def parse_towels(data: str) -> tuple[list[str], frozenset[str]]:
@@ -17,23 +37,148 @@ def parse_towels(data: str) -> tuple[list[str], frozenset[str]]:
 
 
 def count_possible_designs(patterns: list[str], towels: frozenset[str]) -> int:
-    return sum(1 for p in patterns if count_possible(p, towels) >= 1)
+    trie = TowelTrie(towels)
+    return sum(1 for p in patterns if trie.count_arrangements(p) >= 1)
 
 
 def count_possible_arrangements(patterns: list[str], towels: frozenset[str]) -> int:
-    return sum(count_possible(p, towels) for p in patterns)
+    trie = TowelTrie(towels)
+    return sum(trie.count_arrangements(p) for p in patterns)
+
+
+class TowelTrie:
+    """
+    Prefix tree of the towels, stored as flat per-node lists.
+
+    Node 0 is the root, children[node] maps the next stripe color to a child
+    node and is_towel[node] tells whether the path to the node spells a towel.
+    """
+
+    def __init__(self, towels: Iterable[str]) -> None:
+        self.children: list[dict[str, int]] = [{}]
+        self.is_towel: bytearray = bytearray(1)
+        for towel in towels:
+            self.add(towel)
+
+    def add(self, towel: str) -> None:
+        node: int = 0
+        for color in towel:
+            child: Optional[int] = self.children[node].get(color)
+            if child is None:
+                child = len(self.children)
+                self.children[node][color] = child
+                self.children.append({})
+                self.is_towel.append(0)
+            node = child
+        self.is_towel[node] = 1
+
+    def count_arrangements(self, pattern: str) -> int:
+        """
+        Count the ways to build the pattern out of towels.
+
+        ways[i] is the number of arrangements covering the first i stripes. Every
+        reachable position walks the trie along the pattern, so each design takes
+        at most len(pattern) * longest towel steps and never slices a string.
+        """
+        children, is_towel = self.children, self.is_towel
+        ways: list[int] = [0] * (len(pattern) + 1)
+        ways[0] = 1
+        for start in range(len(pattern)):
+            start_ways: int = ways[start]
+            if not start_ways:
+                continue
+            node: Optional[int] = 0
+            for end in range(start, len(pattern)):
+                node = children[node].get(pattern[end])
+                if node is None:
+                    break
+                if is_towel[node]:
+                    ways[end + 1] += start_ways
+        return ways[-1]
+
 
+def count_arrangements_parallel(
+    patterns: Iterable[str],
+    towels: frozenset[str],
+    *,
+    workers: int,
+    chunk_size: int = 1000,
+) -> Iterator[tuple[str, int]]:
+    """
+    Count the arrangements of a stream of patterns across worker processes.
 
-@cache
-def count_possible(pattern: str, towels: frozenset[str]) -> int:
+    Patterns are sent out in chunks and (pattern, count) pairs are yielded as
+    soon as their chunk is done, so not in input order. Only a few chunks per
+    worker are in flight at a time, which lets the input be a lazy iterator
+    over millions of patterns.
+    """
+    pattern_iter: Iterator[str] = iter(patterns)
+    if workers <= 1:
+        trie = TowelTrie(towels)
+        for pattern in pattern_iter:
+            yield pattern, trie.count_arrangements(pattern)
+        return
+
+    # Every worker builds the trie only once, when it starts
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(towels,)
+    ) as executor:
+        pending: set[Future[list[tuple[str, int]]]] = set()
+        while True:
+            while len(pending) < workers * 2:
+                chunk: list[str] = list(islice(pattern_iter, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(count_arrangements_in_worker, chunk))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+# Towel trie for the current worker process, set up by init_worker
+worker_trie: Optional[TowelTrie] = None
+
+
+def init_worker(towels: frozenset[str]) -> None:
+    global worker_trie
+    worker_trie = TowelTrie(towels)
+
+
+def count_arrangements_in_worker(patterns: list[str]) -> list[tuple[str, int]]:
+    assert worker_trie, "Worker must be initialized with a towel trie"
+    return [(pattern, worker_trie.count_arrangements(pattern)) for pattern in patterns]
+
+
+def count_possible(
+    pattern: str,
+    towels: frozenset[str],
+    *,
+    memo: Optional[MemoCache[tuple[str, frozenset[str]], int]] = None,
+) -> int:
+    """
+    Count the arrangements recursively, trying every towel at the front.
+
+    Results are memoized in `memo`, which can be shared between patterns of the
+    same job. Without one, a fresh cache lives only as long as the call.
+    """
     if not pattern:
         return 1
-
-    return sum(
-        count_possible(pattern[len(t) :], towels)
-        for t in towels
-        if pattern.startswith(t)
-    )
+    if memo is None:
+        memo = MemoCache()
+    # frozensets cache their hash, so keying on the towels stays cheap
+    count: Optional[int] = memo.get((pattern, towels))
+    if count is None:
+        count = memo.put(
+            (pattern, towels),
+            sum(
+                count_possible(pattern[len(t) :], towels, memo=memo)
+                for t in towels
+                if pattern.startswith(t)
+            ),
+        )
+    return count
 
 
 if __name__ == "__main__":
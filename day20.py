@@ -1,9 +1,9 @@
+from collections import Counter, defaultdict
 from dataclasses import dataclass
-from itertools import combinations
 from sys import stdin
 from typing import Optional
 
-from lib import Point, manhattan_distance, orthogonal_neighborhood
+from lib import Point, orthogonal_neighborhood
 
 
 def main() -> None:
@@ -63,15 +63,87 @@ def make_costs(grid: Grid) -> dict[Point, int]:
     return cost
 
 
-def count_good_ncheats(grid: Grid, *, n: int, minimum_score: int = 100) -> int:
-    cost: dict[Point, int] = make_costs(grid)
-
-    return sum(
-        1
-        for f, t in combinations(grid.grid, 2)
-        if manhattan_distance(f, t) <= n
-        and abs(cost[t] - cost[f]) - manhattan_distance(f, t) >= minimum_score
+def count_good_ncheats(
+    grid: Grid, *, n: int, minimum_score: int = 100, use_numpy: bool = False
+) -> int:
+    histogram: dict[int, Counter[int]] = cheat_histogram(
+        grid, n=n, minimum_score=minimum_score, use_numpy=use_numpy
     )
+    return sum(sum(savings.values()) for savings in histogram.values())
+
+
+def cheat_histogram(
+    grid: Grid, *, n: int, minimum_score: int = 1, use_numpy: bool = False
+) -> dict[int, Counter[int]]:
+    """
+    Count cheats of at most n picoseconds saving at least minimum_score.
+
+    Returns a histogram of savings for each cheat length. Instead of comparing all
+    pairs of track cells, only the cells within Manhattan distance n of each cell
+    are checked, which is linear in the track length.
+    """
+    assert minimum_score > 0, "Cheats must save time"
+    if use_numpy:
+        return cheat_histogram_numpy(grid, n=n, minimum_score=minimum_score)
+
+    cost, width = padded_costs(grid, n=n)
+    offsets: list[tuple[int, int]] = [
+        (dy * width + dx, abs(dx) + abs(dy))
+        for dy in range(-n, n + 1)
+        for dx in range(-n + abs(dy), n - abs(dy) + 1)
+        if abs(dx) + abs(dy) >= 2
+    ]
+
+    histogram: dict[int, Counter[int]] = defaultdict(Counter)
+    for idx, start_cost in enumerate(cost):
+        if start_cost < 0:
+            continue
+        for offset, length in offsets:
+            # Every cheat is counted once, from the end with the lower cost
+            saving: int = cost[idx + offset] - start_cost - length
+            if saving >= minimum_score:
+                histogram[length][saving] += 1
+    return dict(histogram)
+
+
+def cheat_histogram_numpy(
+    grid: Grid, *, n: int, minimum_score: int = 1
+) -> dict[int, Counter[int]]:
+    # Hack: import numpy here to avoid bringing it as a dependency for unit tests
+    import numpy as np
+
+    flat_cost, width = padded_costs(grid, n=n)
+    cost = np.array(flat_cost, dtype=np.int64).reshape(-1, width)
+    height: int = cost.shape[0] - 2 * n
+    start = cost[n : n + height, n : width - n]
+
+    histogram: dict[int, Counter[int]] = defaultdict(Counter)
+    for dy in range(-n, n + 1):
+        for dx in range(-n + abs(dy), n - abs(dy) + 1):
+            length: int = abs(dx) + abs(dy)
+            if length < 2:
+                continue
+            end = cost[n + dy : n + dy + height, n + dx : width - n + dx]
+            saving = end - start - length
+            saving = saving[(start >= 0) & (saving >= minimum_score)]
+            values, counts = np.unique(saving, return_counts=True)
+            histogram[length].update(dict(zip(values.tolist(), counts.tolist())))
+    return {length: savings for length, savings in histogram.items() if savings}
+
+
+def padded_costs(grid: Grid, *, n: int) -> tuple[list[int], int]:
+    """
+    Lay out the path costs as a flat list with n walls of padding on every side,
+    so that looking up any cell within the cheat distance never needs a bounds
+    check. Walls have a cost of -1. Returns the cost list and its row width.
+    """
+    costs: dict[Point, int] = make_costs(grid)
+    width: int = max(p.x for p in costs) + 1 + 2 * n
+    height: int = max(p.y for p in costs) + 1 + 2 * n
+    flat: list[int] = [-1] * (width * height)
+    for p, c in costs.items():
+        flat[(p.y + n) * width + p.x + n] = c
+    return flat, width
 
 
 def count_good_2cheats(grid: Grid, *, minimum_score: int = 100) -> int:
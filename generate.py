@@ -0,0 +1,439 @@
+"""
+Synthetic input generators for the daily solvers.
+
+Every generator produces a structurally valid puzzle input of the requested size
+from a seeded random number generator, so the same size and seed always give the
+same input. What "size" means depends on the day: the side length for grid
+puzzles and the number of lines, digits or items for the others.
+
+Usage:
+    python3 generate.py DAY [--size N | --scale FACTOR] [--seed SEED]
+"""
+import argparse
+from collections import deque
+from dataclasses import dataclass
+from math import isqrt
+from random import Random
+from typing import Callable, Iterable
+
+from lib import Point, orthogonal_directions
+
+TOWEL_COLORS: str = "wubrg"
+ANTENNA_FREQUENCIES: str = (
+    "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic puzzle input.")
+    parser.add_argument("day", type=int, help="puzzle day")
+    size_group = parser.add_mutually_exclusive_group()
+    size_group.add_argument("--size", type=int, help="generator specific input size")
+    size_group.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="input size relative to a real puzzle input (default: 1)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    if args.size is not None:
+        print(generate(args.day, args.size, seed=args.seed), end="")
+    else:
+        print(generate_scaled(args.day, args.scale, seed=args.seed), end="")
+
+
+@dataclass(frozen=True)
+class Generator:
+    generate: Callable[[int, Random], str]
+    # size that roughly matches a real puzzle input
+    base_size: int
+    # grid sizes are side lengths, so they scale with the square root
+    is_grid: bool = False
+
+
+def generate(day: int, size: int, *, seed: int = 0) -> str:
+    return GENERATORS[day].generate(size, Random(seed))
+
+
+def generate_scaled(day: int, scale: float, *, seed: int = 0) -> str:
+    """Generate an input roughly `scale` times the size of a real puzzle input"""
+    return generate(day, scaled_size(day, scale), seed=seed)
+
+
+def scaled_size(day: int, scale: float) -> int:
+    generator = GENERATORS[day]
+    if generator.is_grid:
+        return max(1, round(generator.base_size * scale**0.5))
+    return max(1, round(generator.base_size * scale))
+
+
+def lines(it: Iterable[str]) -> str:
+    return "".join(f"{line}\n" for line in it)
+
+
+def grid_string(grid: list[list[str]]) -> str:
+    return lines("".join(row) for row in grid)
+
+
+def carve_maze(width: int, height: int, rng: Random) -> list[list[str]]:
+    """
+    Carve a perfect maze with a randomized depth-first search.
+
+    The grid is surrounded by walls and open cells are at odd coordinates, so the
+    dimensions are rounded down to odd numbers.
+    """
+    width -= 1 - width % 2
+    height -= 1 - height % 2
+    grid: list[list[str]] = [["#"] * width for _ in range(height)]
+    grid[1][1] = "."
+    stack: list[Point] = [Point(1, 1)]
+    while stack:
+        current = stack[-1]
+        candidates: list[Point] = [
+            d
+            for d in orthogonal_directions()
+            if 0 < (current + d * 2).x < width - 1
+            and 0 < (current + d * 2).y < height - 1
+            and grid[(current + d * 2).y][(current + d * 2).x] == "#"
+        ]
+        if not candidates:
+            stack.pop()
+            continue
+        d = rng.choice(candidates)
+        for p in (current + d, current + d * 2):
+            grid[p.y][p.x] = "."
+        stack.append(current + d * 2)
+    return grid
+
+
+def generate_day01(size: int, rng: Random) -> str:
+    return lines(
+        f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}"
+        for _ in range(size)
+    )
+
+
+def generate_day02(size: int, rng: Random) -> str:
+    def report() -> list[int]:
+        step = rng.choice([-1, 1])
+        levels: list[int] = [rng.randint(10, 90)]
+        for _ in range(rng.randint(4, 7)):
+            levels.append(levels[-1] + step * rng.randint(1, 3))
+        if rng.random() < 0.5:
+            # break the report in a random spot, possibly beyond tolerance
+            levels[rng.randrange(len(levels))] += rng.randint(-5, 5)
+        return levels
+
+    return lines(" ".join(map(str, report())) for _ in range(size))
+
+
+def generate_day03(size: int, rng: Random) -> str:
+    noise: list[str] = ["mul(", "mul[1,2]", "(", ")", ",", "}", "what()", "@", " "]
+    chunks: list[str] = []
+    for _ in range(size):
+        chunks.extend(rng.choice(noise) for _ in range(rng.randint(0, 4)))
+        roll = rng.random()
+        if roll < 0.05:
+            chunks.append("do()")
+        elif roll < 0.1:
+            chunks.append("don't()")
+        else:
+            chunks.append(f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})")
+    return "".join(chunks) + "\n"
+
+
+def generate_day04(size: int, rng: Random) -> str:
+    return grid_string([[rng.choice("XMAS") for _ in range(size)] for _ in range(size)])
+
+
+def generate_day05(size: int, rng: Random) -> str:
+    """
+    Pages have a hidden global order. Rules are given between pages that are close
+    to each other in that order, and every update only uses pages from one such
+    neighborhood, so all pairs within an update are covered by a rule.
+    """
+    window: int = 24
+    page_count: int = size + window
+    pages: list[int] = rng.sample(range(10, 10 + 10 * page_count), page_count)
+
+    rules: list[str] = [
+        f"{pages[i]}|{pages[j]}"
+        for i in range(page_count)
+        for j in range(i + 1, min(i + window, page_count))
+    ]
+    rng.shuffle(rules)
+
+    updates: list[str] = []
+    for _ in range(size):
+        start = rng.randrange(page_count - window)
+        length = rng.randrange(5, window, 2)
+        indices = sorted(rng.sample(range(start, start + window), length))
+        if rng.random() < 0.5:
+            rng.shuffle(indices)
+        updates.append(",".join(str(pages[i]) for i in indices))
+
+    return lines(rules) + "\n" + lines(updates)
+
+
+def generate_day06(size: int, rng: Random) -> str:
+    grid: list[list[str]] = [
+        ["#" if rng.random() < 0.05 else "." for _ in range(size)] for _ in range(size)
+    ]
+    guard = Point(rng.randrange(size), rng.randrange(1, size))
+    grid[guard.y][guard.x] = "^"
+    # make sure the guard isn't stuck inside four walls
+    grid[guard.y - 1][guard.x] = "."
+    return grid_string(grid)
+
+
+def generate_day07(size: int, rng: Random) -> str:
+    def equation() -> str:
+        numbers: list[int] = [rng.randint(1, 999) for _ in range(rng.randint(2, 12))]
+        target: int = numbers[0]
+        for n in numbers[1:]:
+            op = rng.choice("+*|")
+            if op == "+":
+                target += n
+            elif op == "*":
+                target *= n
+            else:
+                target = int(f"{target}{n}")
+        if rng.random() < 0.5:
+            # most likely not solvable anymore
+            target += rng.randint(1, 9)
+        return f"{target}: {' '.join(map(str, numbers))}"
+
+    return lines(equation() for _ in range(size))
+
+
+def generate_day08(size: int, rng: Random) -> str:
+    return grid_string(
+        [
+            [
+                rng.choice(ANTENNA_FREQUENCIES) if rng.random() < 0.04 else "."
+                for _ in range(size)
+            ]
+            for _ in range(size)
+        ]
+    )
+
+
+def generate_day09(size: int, rng: Random) -> str:
+    # files are never empty, free space can be
+    digits: list[str] = [
+        str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9))
+        for i in range(size + (1 - size % 2))
+    ]
+    return "".join(digits) + "\n"
+
+
+def generate_day10(size: int, rng: Random) -> str:
+    # diagonal slopes make for plenty of hiking trails, noise breaks some of them
+    return grid_string(
+        [
+            [
+                str(rng.randint(0, 9) if rng.random() < 0.2 else (x + y) % 10)
+                for x in range(size)
+            ]
+            for y in range(size)
+        ]
+    )
+
+
+def generate_day11(size: int, rng: Random) -> str:
+    return " ".join(str(rng.randint(0, 10_000_000)) for _ in range(size)) + "\n"
+
+
+def generate_day12(size: int, rng: Random) -> str:
+    # coarse blocks of plants with some noise make regions of varying shapes
+    block: int = 5
+    blocks: list[list[str]] = [
+        [rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(size // block + 1)]
+        for _ in range(size // block + 1)
+    ]
+    return grid_string(
+        [
+            [
+                rng.choice("ABC")
+                if rng.random() < 0.05
+                else blocks[y // block][x // block]
+                for x in range(size)
+            ]
+            for y in range(size)
+        ]
+    )
+
+
+def generate_day13(size: int, rng: Random) -> str:
+    def machine() -> str:
+        a = Point(rng.randint(10, 99), rng.randint(10, 99))
+        b = Point(rng.randint(10, 99), rng.randint(10, 99))
+        prize = a * rng.randint(0, 100) + b * rng.randint(0, 100)
+        if rng.random() < 0.5:
+            prize = prize + Point(rng.randint(1, 9), rng.randint(1, 9))
+        return (
+            f"Button A: X+{a.x}, Y+{a.y}\n"
+            f"Button B: X+{b.x}, Y+{b.y}\n"
+            f"Prize: X={prize.x}, Y={prize.y}\n"
+        )
+
+    return "\n".join(machine() for _ in range(size))
+
+
+def generate_day14(size: int, rng: Random) -> str:
+    # the simulation has a fixed 101x103 floor, so only the robot count scales
+    return lines(
+        f"p={rng.randrange(101)},{rng.randrange(103)}"
+        f" v={rng.randint(-99, 99)},{rng.randint(-99, 99)}"
+        for _ in range(size)
+    )
+
+
+def generate_day15(size: int, rng: Random) -> str:
+    grid: list[list[str]] = [
+        [
+            "#"
+            if x in (0, size - 1) or y in (0, size - 1) or rng.random() < 0.05
+            else "O"
+            if rng.random() < 0.3
+            else "."
+            for x in range(size)
+        ]
+        for y in range(size)
+    ]
+    grid[size // 2][size // 2] = "@"
+    moves: str = "".join(rng.choice("<>^v") for _ in range(size * size * 2))
+    return (
+        grid_string(grid)
+        + "\n"
+        + lines(moves[i : i + 1000] for i in range(0, len(moves), 1000))
+    )
+
+
+def generate_day16(size: int, rng: Random) -> str:
+    grid = carve_maze(size, size, rng)
+    height, width = len(grid), len(grid[0])
+    # knock down some walls between corridors to create alternative routes
+    for _ in range(width * height // 50):
+        x, y = rng.randrange(1, width - 1), rng.randrange(1, height - 1)
+        if (x + y) % 2 == 1:
+            grid[y][x] = "."
+    grid[height - 2][1] = "S"
+    grid[1][width - 2] = "E"
+    return grid_string(grid)
+
+
+def generate_day17(size: int, rng: Random) -> str:
+    """
+    The programs follow the usual pattern: scramble the lowest 3 bits of A, print
+    them and shift A by 3 bits until A runs out. The output has `size` digits.
+
+    The two XOR constants differ so that A=0 doesn't print 0, like in real inputs.
+    """
+    a: int = rng.getrandbits(3 * size) | (1 << (3 * (size - 1)))
+    xor1, xor2 = rng.sample(range(8), 2)
+    program: list[int] = [2, 4, 1, xor1, 7, 5, 1, xor2, 4, rng.randrange(8)]
+    program += [0, 3, 5, 5, 3, 0]
+    return (
+        f"Register A: {a}\nRegister B: 0\nRegister C: 0\n\n"
+        f"Program: {','.join(map(str, program))}\n"
+    )
+
+
+def generate_day18(size: int, rng: Random) -> str:
+    """
+    Every cell except the start and the goal gets a falling byte, so the path is
+    guaranteed to get blocked eventually.
+    """
+    cells: list[Point] = [
+        Point(x, y)
+        for y in range(size)
+        for x in range(size)
+        if (x, y) not in ((0, 0), (size - 1, size - 1))
+    ]
+    rng.shuffle(cells)
+    return lines(f"{p.x},{p.y}" for p in cells)
+
+
+def generate_day19(size: int, rng: Random) -> str:
+    def random_stripes(length: int) -> str:
+        return "".join(rng.choice(TOWEL_COLORS) for _ in range(length))
+
+    towels: list[str] = sorted(
+        {random_stripes(rng.randint(1, 8)) for _ in range(max(8, isqrt(size) * 40))}
+    )
+
+    def design() -> str:
+        parts: list[str] = []
+        while sum(map(len, parts)) < rng.randint(40, 60):
+            parts.append(rng.choice(towels))
+        if rng.random() < 0.3:
+            # most likely impossible to arrange anymore
+            parts.insert(rng.randrange(len(parts)), random_stripes(3))
+        return "".join(parts)
+
+    return ", ".join(towels) + "\n\n" + lines(design() for _ in range(size))
+
+
+def generate_day20(size: int, rng: Random) -> str:
+    """
+    Carve a maze and keep only the path from the start to the cell furthest away
+    from it, which makes a single winding race track.
+    """
+    grid = carve_maze(size, size, rng)
+    start = Point(1, 1)
+    prev: dict[Point, Point] = {}
+    to_check: deque[Point] = deque([start])
+    seen: set[Point] = {start}
+    end: Point = start
+    while to_check:
+        end = to_check.popleft()
+        for d in orthogonal_directions():
+            p = end + d
+            if grid[p.y][p.x] == "." and p not in seen:
+                seen.add(p)
+                prev[p] = end
+                to_check.append(p)
+
+    track: set[Point] = {end}
+    current: Point = end
+    while current in prev:
+        current = prev[current]
+        track.add(current)
+
+    for y, row in enumerate(grid):
+        for x in range(len(row)):
+            row[x] = "." if Point(x, y) in track else "#"
+    grid[start.y][start.x] = "S"
+    grid[end.y][end.x] = "E"
+    return grid_string(grid)
+
+
+GENERATORS: dict[int, Generator] = {
+    1: Generator(generate_day01, 1000),
+    2: Generator(generate_day02, 1000),
+    3: Generator(generate_day03, 700),
+    4: Generator(generate_day04, 140, is_grid=True),
+    5: Generator(generate_day05, 200),
+    6: Generator(generate_day06, 130, is_grid=True),
+    7: Generator(generate_day07, 850),
+    8: Generator(generate_day08, 50, is_grid=True),
+    9: Generator(generate_day09, 20000),
+    10: Generator(generate_day10, 59, is_grid=True),
+    11: Generator(generate_day11, 8),
+    12: Generator(generate_day12, 140, is_grid=True),
+    13: Generator(generate_day13, 320),
+    14: Generator(generate_day14, 500),
+    15: Generator(generate_day15, 50, is_grid=True),
+    16: Generator(generate_day16, 141, is_grid=True),
+    17: Generator(generate_day17, 16),
+    18: Generator(generate_day18, 71, is_grid=True),
+    19: Generator(generate_day19, 400),
+    20: Generator(generate_day20, 141, is_grid=True),
+}
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,39 @@
-from dataclasses import dataclass
-from typing import Callable, Iterable, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
 
 T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
 
 
-@dataclass(eq=True, frozen=True)
-class Point:
+class Point(NamedTuple):
+    """
+    A 2D point or vector.
+
+    Points are immutable tuples: hashing and comparison run in C, and building a
+    new Point doesn't go through object.__setattr__ like a frozen dataclass does.
+    Ordering is by x first and then y.
+    """
+
     x: int
     y: int
 
-    def __add__(self, rhs: "Point") -> "Point":
-        return Point(x=self.x + rhs.x, y=self.y + rhs.y)
+    def __add__(self, rhs: "Point") -> "Point":  # type: ignore[override]
+        return Point(self.x + rhs.x, self.y + rhs.y)
 
     def __sub__(self, rhs: "Point") -> "Point":
-        return Point(x=self.x - rhs.x, y=self.y - rhs.y)
-
-    def __mul__(self, rhs: int) -> "Point":
-        return Point(x=self.x * rhs, y=self.y * rhs)
+        return Point(self.x - rhs.x, self.y - rhs.y)
 
-    def __lt__(self, rhs: "Point") -> bool:
-        return (self.x, self.y) < (rhs.x, rhs.y)
+    def __mul__(self, rhs: int) -> "Point":  # type: ignore[override]
+        return Point(self.x * rhs, self.y * rhs)
 
     def __mod__(self, rhs: "Point") -> "Point":
         return Point(self.x % rhs.x, self.y % rhs.y)
@@ -96,10 +110,288 @@ def orthogonal_neighborhood(p: Point) -> Iterable[Point]:
     return (p + d for d in orthogonal_directions())
 
 
+def clockwise_directions() -> list[Point]:
+    """Orthogonal directions in the order of turning right, starting north"""
+    return [
+        Point.north(),
+        Point.east(),
+        Point.south(),
+        Point.west(),
+    ]
+
+
 def manhattan_distance(p1: Point, p2: Point) -> int:
     return abs(p1.x - p2.x) + abs(p1.y - p2.y)
 
 
+@dataclass
+class DenseGrid:
+    """
+    A rectangular grid of single-character cells stored in a flat bytearray.
+
+    Cells can be addressed either with a Point or with an integer index
+    y * width + x. Working with integer indices avoids allocating and hashing a
+    Point for every step, which matters a lot on large maps.
+    """
+
+    width: int
+    height: int
+    cells: bytearray
+    # index offsets for north, west, east and south, in orthogonal_directions order
+    offsets: tuple[int, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        assert len(self.cells) == self.width * self.height, "Grid must be rectangular"
+        self.offsets = (-self.width, -1, 1, self.width)
+
+    @staticmethod
+    def filled(width: int, height: int, ch: str = ".") -> "DenseGrid":
+        return DenseGrid(width, height, bytearray(ch.encode()) * (width * height))
+
+    @staticmethod
+    def from_string(data: str) -> "DenseGrid":
+        lines: list[str] = [line.strip() for line in data.strip().split("\n") if line]
+        width: int = len(lines[0]) if lines else 0
+        assert all(len(line) == width for line in lines), "Grid must be rectangular"
+        return DenseGrid(width, len(lines), bytearray("".join(lines).encode()))
+
+    @staticmethod
+    def from_points(
+        points: Iterable[Point], width: int, height: int, ch: str = "#", fill: str = "."
+    ) -> "DenseGrid":
+        """Adapter for grids stored as a set of Points"""
+        grid = DenseGrid.filled(width, height, fill)
+        for p in points:
+            grid[p] = ch
+        return grid
+
+    @staticmethod
+    def from_dict(
+        d: dict[Point, str], width: Optional[int] = None, height: Optional[int] = None
+    ) -> "DenseGrid":
+        """
+        Adapter for grids stored as a dict of Points. Missing cells are filled
+        with spaces.
+        """
+        width = width if width is not None else max(p.x for p in d) + 1
+        height = height if height is not None else max(p.y for p in d) + 1
+        grid = DenseGrid.filled(width, height, " ")
+        for p, ch in d.items():
+            grid[p] = ch
+        return grid
+
+    def to_dict(self) -> dict[Point, str]:
+        return {self.point(idx): chr(ch) for idx, ch in enumerate(self.cells)}
+
+    def copy(self) -> "DenseGrid":
+        return DenseGrid(self.width, self.height, bytearray(self.cells))
+
+    def index(self, p: Point) -> int:
+        return p.y * self.width + p.x
+
+    def point(self, idx: int) -> Point:
+        y, x = divmod(idx, self.width)
+        return Point(x, y)
+
+    def in_bounds(self, p: Point) -> bool:
+        return 0 <= p.x < self.width and 0 <= p.y < self.height
+
+    def __contains__(self, p: Point) -> bool:
+        return self.in_bounds(p)
+
+    def __getitem__(self, p: Point) -> str:
+        assert self.in_bounds(p), "Point must be inside the grid"
+        return chr(self.cells[self.index(p)])
+
+    def __setitem__(self, p: Point, ch: str) -> None:
+        assert self.in_bounds(p), "Point must be inside the grid"
+        self.cells[self.index(p)] = ord(ch)
+
+    def get(self, p: Point, default: Optional[str] = None) -> Optional[str]:
+        return chr(self.cells[self.index(p)]) if self.in_bounds(p) else default
+
+    def find(self, ch: str) -> Iterable[int]:
+        """Iterate over the indices of all cells containing ch"""
+        needle: int = ord(ch)
+        return (idx for idx, cell in enumerate(self.cells) if cell == needle)
+
+    def neighbors(self, idx: int) -> Iterable[int]:
+        """Indices of the orthogonal neighbors of idx that are inside the grid"""
+        x: int = idx % self.width
+        north, west, east, south = self.offsets
+        if idx >= self.width:
+            yield idx + north
+        if x > 0:
+            yield idx + west
+        if x < self.width - 1:
+            yield idx + east
+        if idx + south < len(self.cells):
+            yield idx + south
+
+    def __str__(self) -> str:
+        return "\n".join(
+            self.cells[y * self.width : (y + 1) * self.width].decode()
+            for y in range(self.height)
+        )
+
+
+UNREACHED: int = 2**62
+
+
+def heading_distances(
+    grid: DenseGrid,
+    sources: Iterable[int],
+    *,
+    targets: Iterable[int] = (),
+    move_cost: int = 1,
+    turn_cost: int = 1000,
+    reverse: bool = False,
+) -> list[int]:
+    """
+    Dijkstra over (cell, heading) states on a grid, where walls are "#".
+
+    A state is encoded as cell_index * 4 + heading, with headings numbered in
+    clockwise_directions order. Each state can step forward for move_cost or turn
+    90 degrees for turn_cost. Returns the distance to every state, or UNREACHED.
+    With reverse=True, steps go backwards, giving distances to the sources.
+
+    Edge costs are small integers, so the priority queue is a ring of buckets, one
+    for each distance up to the largest edge cost. The search stops as soon as any
+    of the targets is settled; all states closer than that are final by then.
+    """
+    width: int = grid.width
+    cells: bytearray = grid.cells
+    wall: int = ord("#")
+    steps: list[int] = [d.y * width + d.x for d in clockwise_directions()]
+    if reverse:
+        steps = [-step for step in steps]
+
+    def can_step(idx: int, step: int) -> bool:
+        x: int = idx % width
+        if step == 1:
+            return x < width - 1
+        if step == -1:
+            return x > 0
+        return 0 <= idx + step < len(cells)
+
+    distance: list[int] = [UNREACHED] * (len(cells) * 4)
+    target_set: set[int] = set(targets)
+    buckets: list[list[int]] = [[] for _ in range(max(move_cost, turn_cost) + 1)]
+    pending: int = 0
+    for state in sources:
+        distance[state] = 0
+        buckets[0].append(state)
+        pending += 1
+
+    current: int = 0
+    while pending:
+        bucket = buckets[current % len(buckets)]
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            if distance[state] != current:
+                # stale entry, the state was reached more cheaply later
+                continue
+            if state in target_set:
+                return distance
+
+            idx, heading = divmod(state, 4)
+            moves: list[tuple[int, int]] = [
+                (state - heading + (heading + 1) % 4, current + turn_cost),
+                (state - heading + (heading + 3) % 4, current + turn_cost),
+            ]
+            step: int = steps[heading]
+            if can_step(idx, step) and cells[idx + step] != wall:
+                moves.append((state + step * 4, current + move_cost))
+
+            for next_state, next_distance in moves:
+                if next_distance < distance[next_state]:
+                    distance[next_state] = next_distance
+                    buckets[next_distance % len(buckets)].append(next_state)
+                    pending += 1
+        current += 1
+
+    return distance
+
+
+class UnionFind:
+    """Disjoint sets over the integers 0..size-1"""
+
+    def __init__(self, size: int) -> None:
+        self.parent: list[int] = list(range(size))
+        self.size: list[int] = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            # path halving keeps the trees shallow
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class MemoCache(Generic[K, T]):
+    """
+    Memoization table with an explicit owner, unlike functools.cache.
+
+    Whoever creates the cache decides how long it lives, so memory is released
+    as soon as a job drops it or calls clear(). With a maxsize the least recently
+    used entries are evicted once the table is full.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        self.maxsize: Optional[int] = maxsize
+        self.entries: OrderedDict[K, T] = OrderedDict()
+        self.stats: CacheStats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: K) -> Optional[T]:
+        value: Optional[T] = self.entries.get(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        if self.maxsize is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: T) -> T:
+        self.entries[key] = value
+        if self.maxsize is not None:
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.stats.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and start counting statistics afresh"""
+        self.entries.clear()
+        self.stats = CacheStats()
+
+
 def transpose(lst: Iterable[Iterable[T]]) -> list[tuple[T, ...]]:
     return list(zip(*lst))
 
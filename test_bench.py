@@ -0,0 +1,23 @@
+import unittest
+
+from bench import SOLVERS, bench_input, find_regressions
+from test_day01 import EXAMPLE_INPUT
+
+
+class BenchTestCase(unittest.TestCase):
+    def test_bench_input(self):
+        results = bench_input(SOLVERS[1], EXAMPLE_INPUT, repeat=1)
+        self.assertEqual(set(results), {"parse", "part1", "part2"})
+        self.assertEqual(results["part1"]["answer"], "11")
+        self.assertEqual(results["part2"]["answer"], "31")
+        self.assertGreater(results["parse"]["peak_bytes"], 0)
+
+    def test_find_regressions(self):
+        baseline = {"a.txt": {"part1": {"seconds": 1.0, "answer": "1"}}}
+        faster = {"a.txt": {"part1": {"seconds": 0.5, "answer": "1"}}}
+        slower = {"a.txt": {"part1": {"seconds": 1.2, "answer": "1"}}}
+        wrong = {"a.txt": {"part1": {"seconds": 1.0, "answer": "2"}}}
+        self.assertEqual(find_regressions(baseline, faster), [])
+        self.assertEqual(find_regressions(baseline, slower, threshold=0.25), [])
+        self.assertEqual(len(find_regressions(baseline, slower, threshold=0.1)), 1)
+        self.assertEqual(len(find_regressions(baseline, wrong)), 1)
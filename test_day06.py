@@ -23,3 +23,7 @@ class Day06TestCase(unittest.TestCase):
             self.assertEqual(count_guard_positions(grid, guard), 41)
         with self.subTest("Part 2"):
             self.assertEqual(count_looping_configurations(grid, guard), 6)
+
+    def test_workers(self):
+        grid, guard = parse_map(EXAMPLE_MAP)
+        self.assertEqual(count_looping_configurations(grid, guard, workers=2), 6)
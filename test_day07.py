@@ -1,6 +1,11 @@
 import unittest
 
-from day07 import parse_equations, sum_of_true_equations
+from day07 import (
+    check_equation_backwards,
+    concat_int,
+    parse_equations,
+    sum_of_true_equations,
+)
 
 EXAMPLE_EQUATIONS = """
 190: 10 19
@@ -24,3 +29,23 @@ class Day07TestCase(unittest.TestCase):
             self.assertEqual(
                 sum_of_true_equations(equations, enable_concat=True), 11387
             )
+
+    def test_concat(self):
+        self.assertEqual(concat_int(15, 6), 156)
+        self.assertEqual(concat_int(12, 345), 12345)
+        self.assertEqual(concat_int(7, 10), 710)
+        self.assertEqual(concat_int(7, 0), 70)
+
+    def test_backwards(self):
+        self.assertTrue(check_equation_backwards(7290, [6, 8, 6, 15], enable_concat=True))
+        self.assertFalse(check_equation_backwards(7290, [6, 8, 6, 15]))
+        self.assertTrue(check_equation_backwards(0, [5, 3, 0]))
+        self.assertFalse(check_equation_backwards(1, [5, 3, 0]))
+
+        # far too many operands for a forward search over 3**29 combinations
+        numbers = [1] * 30
+        self.assertTrue(check_equation_backwards(1 * 10**29 + 1, [1] * 2 + numbers[2:]))
+        self.assertTrue(
+            check_equation_backwards(int("1" * 30), numbers, enable_concat=True)
+        )
+        self.assertFalse(check_equation_backwards(10**30, numbers, enable_concat=True))
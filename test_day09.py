@@ -1,6 +1,15 @@
+import tempfile
 import unittest
 
-from day09 import DiskMap, checksum, checksum2
+from day09 import (
+    DiskMap,
+    checksum,
+    checksum2,
+    compact_checksum,
+    parse_lengths,
+    read_lengths,
+    whole_file_checksum,
+)
 
 EXAMPLE_BLOCKS = "2333133121414131402"
 
@@ -12,3 +21,19 @@ class Day09TestCase(unittest.TestCase):
             self.assertEqual(checksum(diskmap), 1928)
         with self.subTest("Part 2"):
             self.assertEqual(checksum2(diskmap), 2858)
+
+    def test_streaming(self):
+        lengths = parse_lengths(EXAMPLE_BLOCKS)
+        with self.subTest("Part 1"):
+            self.assertEqual(compact_checksum(lengths), 1928)
+        with self.subTest("Part 2"):
+            self.assertEqual(whole_file_checksum(lengths), 2858)
+
+    def test_memory_mapped(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+            f.write(EXAMPLE_BLOCKS + "\n")
+            f.flush()
+            lengths = read_lengths(f.name)
+        self.assertEqual(list(lengths), [int(ch) for ch in EXAMPLE_BLOCKS])
+        self.assertEqual(compact_checksum(lengths), 1928)
+        self.assertEqual(whole_file_checksum(lengths), 2858)
@@ -1,6 +1,8 @@
+import importlib.util
 import unittest
 
-from day11 import blink
+from day11 import blink, blink_history, blink_impl, blink_power, parse_stones
+from lib import MemoCache
 
 
 class Day11TestCase(unittest.TestCase):
@@ -20,3 +22,38 @@ class Day11TestCase(unittest.TestCase):
     def test_example_value(self):
         stones = [125, 17]
         self.assertEqual(blink(stones, n=25), 55312)
+
+    def test_recursive(self):
+        self.assertEqual(sum(blink_impl(stone, n=25) for stone in [125, 17]), 55312)
+
+        memo: MemoCache[tuple[int, int], int] = MemoCache(maxsize=100)
+        self.assertEqual(sum(blink_impl(s, n=25, memo=memo) for s in [125, 17]), 55312)
+        self.assertLessEqual(len(memo), 100)
+        self.assertGreater(memo.stats.evictions, 0)
+
+    def test_many_blinks(self):
+        stones = parse_stones("125 17\n")
+        history = list(blink_history(stones, n=2000))
+        self.assertEqual(len(history), 2000)
+        # the set of values seen stops growing long before this
+        self.assertEqual(len(history[-1]), len(history[-2]))
+        self.assertEqual(sum(history[-1].values()), blink(stones, n=2000))
+
+    def test_matrix_power(self):
+        stones = [125, 17]
+        for n in [0, 1, 6, 25, 75]:
+            with self.subTest(n=n):
+                self.assertEqual(blink_power(stones, n=n), blink(stones, n=n))
+        self.assertEqual(
+            blink_power(stones, n=300, modulus=1_000_000_007),
+            blink(stones, n=300) % 1_000_000_007,
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "requires numpy")
+    def test_matrix_power_numpy(self):
+        modulus = 2**31 - 1
+        stones = [0]
+        self.assertEqual(
+            blink_power(stones, n=300, modulus=modulus, use_numpy=True),
+            blink(stones, n=300) % modulus,
+        )
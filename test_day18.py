@@ -1,6 +1,16 @@
 import unittest
 
-from day18 import Grid, first_blocking_coordinate, shortest_path_length
+from day18 import (
+    Grid,
+    astar_search,
+    bfs_search,
+    bidirectional_search,
+    first_blocking_coordinate,
+    first_blocking_coordinate_bisect,
+    first_blocking_coordinate_online,
+    shortest_path,
+    shortest_path_length,
+)
 from lib import Point
 
 EXAMPLE_BYTES = """
@@ -40,3 +50,23 @@ class Day18TestCase(unittest.TestCase):
             self.assertEqual(shortest_path_length(grid.simulate(n=12)), 22)
         with self.subTest("Part 2"):
             self.assertEqual(first_blocking_coordinate(grid), Point(6, 1))
+
+    def test_blocking_strategies(self):
+        for strategy in [
+            first_blocking_coordinate_bisect,
+            first_blocking_coordinate_online,
+        ]:
+            with self.subTest(strategy.__name__):
+                grid = Grid.from_string(EXAMPLE_BYTES)
+                grid.goal = Point(6, 6)
+                self.assertEqual(strategy(grid), Point(6, 1))
+
+    def test_search_backends(self):
+        grid = Grid.from_string(EXAMPLE_BYTES)
+        grid.goal = Point(6, 6)
+        for search in [bfs_search, astar_search, bidirectional_search]:
+            with self.subTest(search.__name__):
+                path = shortest_path(grid.simulate(12), search=search)
+                self.assertEqual(len(path), 22)
+                path = shortest_path(grid.simulate(21), search=search)
+                self.assertEqual(path, set())
@@ -1,6 +1,14 @@
 import unittest
 
-from day19 import count_possible_arrangements, count_possible_designs, parse_towels
+from day19 import (
+    TowelTrie,
+    count_arrangements_parallel,
+    count_possible,
+    count_possible_arrangements,
+    count_possible_designs,
+    parse_towels,
+)
+from lib import MemoCache
 
 EXAMPLE_TOWELS = """
 r, wr, b, g, bwu, rb, gb, br
@@ -23,3 +31,28 @@ class Day19TestCase(unittest.TestCase):
             self.assertEqual(count_possible_designs(patterns, towels), 6)
         with self.subTest("Part 2"):
             self.assertEqual(count_possible_arrangements(patterns, towels), 16)
+
+    def test_trie(self):
+        patterns, towels = parse_towels(EXAMPLE_TOWELS)
+        trie = TowelTrie(towels)
+        expected = [2, 1, 4, 6, 0, 1, 2, 0]
+        self.assertEqual([trie.count_arrangements(p) for p in patterns], expected)
+        self.assertEqual([count_possible(p, towels) for p in patterns], expected)
+
+    def test_shared_memo(self):
+        patterns, towels = parse_towels(EXAMPLE_TOWELS)
+        memo: MemoCache[tuple[str, frozenset[str]], int] = MemoCache(maxsize=8)
+        counts = [count_possible(p, towels, memo=memo) for p in patterns]
+        self.assertEqual(counts, [2, 1, 4, 6, 0, 1, 2, 0])
+        self.assertLessEqual(len(memo), 8)
+        self.assertGreater(memo.stats.hits, 0)
+
+    def test_parallel(self):
+        patterns, towels = parse_towels(EXAMPLE_TOWELS)
+        expected = dict(zip(patterns, [2, 1, 4, 6, 0, 1, 2, 0]))
+        for workers in [1, 2]:
+            with self.subTest(workers=workers):
+                results = count_arrangements_parallel(
+                    iter(patterns), towels, workers=workers, chunk_size=3
+                )
+                self.assertEqual(dict(results), expected)
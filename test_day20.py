@@ -1,6 +1,7 @@
+import importlib.util
 import unittest
 
-from day20 import Grid, count_good_2cheats, count_good_20cheats
+from day20 import Grid, cheat_histogram, count_good_2cheats, count_good_20cheats
 
 EXAMPLE_GRID = """
 ###############
@@ -33,3 +34,17 @@ class Day20TestCase(unittest.TestCase):
         self.assertEqual(count_good_20cheats(grid, minimum_score=70), 41)
         self.assertEqual(count_good_20cheats(grid, minimum_score=74), 7)
         self.assertEqual(count_good_20cheats(grid, minimum_score=76), 3)
+
+    def test_histogram(self):
+        grid = Grid.from_string(EXAMPLE_GRID)
+        expected = {2: 14, 4: 14, 6: 2, 8: 4, 10: 2, 12: 3, 20: 1, 36: 1, 38: 1}
+        expected.update({40: 1, 64: 1})
+        self.assertEqual(cheat_histogram(grid, n=2), {2: expected})
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "requires numpy")
+    def test_numpy(self):
+        grid = Grid.from_string(EXAMPLE_GRID)
+        self.assertEqual(
+            cheat_histogram(grid, n=20, minimum_score=50, use_numpy=True),
+            cheat_histogram(grid, n=20, minimum_score=50),
+        )
@@ -0,0 +1,27 @@
+import unittest
+
+from bench import SOLVERS
+from day20 import Grid, make_costs
+from generate import GENERATORS, generate, scaled_size
+
+
+class GenerateTestCase(unittest.TestCase):
+    def test_reproducible(self):
+        for day in GENERATORS:
+            with self.subTest(f"Day {day}", day=day):
+                first = generate(day, 20, seed=1)
+                self.assertEqual(first, generate(day, 20, seed=1))
+                self.assertNotEqual(first, generate(day, 20, seed=2))
+
+    def test_parseable(self):
+        for day in GENERATORS:
+            with self.subTest(f"Day {day}", day=day):
+                SOLVERS[day].parse(generate(day, 20))
+
+    def test_scaled_size(self):
+        self.assertEqual(scaled_size(9, 10), 200000)
+        self.assertEqual(scaled_size(20, 100), 1410)
+
+    def test_single_track(self):
+        grid = Grid.from_string(generate(20, 41))
+        self.assertEqual(len(make_costs(grid)), len(grid.grid))
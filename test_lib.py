@@ -0,0 +1,100 @@
+import unittest
+
+from lib import (
+    UNREACHED,
+    CacheStats,
+    DenseGrid,
+    MemoCache,
+    Point,
+    UnionFind,
+    heading_distances,
+)
+
+EXAMPLE_GRID = """
+#..
+.#.
+..#
+""".strip()
+
+
+class PointTestCase(unittest.TestCase):
+    def test_arithmetic(self):
+        self.assertEqual(Point(1, 2) + Point(3, 4), Point(4, 6))
+        self.assertEqual(Point(1, 2) - Point(3, 4), Point(-2, -2))
+        self.assertEqual(Point(1, 2) * 3, Point(3, 6))
+        self.assertEqual(Point(-1, 7) % Point(5, 5), Point(4, 2))
+        self.assertEqual(Point.north().rotate_right(), Point.east())
+
+    def test_ordering_and_hashing(self):
+        self.assertLess(Point(0, 5), Point(1, 0))
+        self.assertLess(Point(1, 0), Point(1, 1))
+        self.assertEqual(len({Point(1, 2), Point(x=1, y=2)}), 1)
+        with self.assertRaises(AttributeError):
+            Point(1, 2).x = 3  # type: ignore[misc]
+
+
+class DenseGridTestCase(unittest.TestCase):
+    def test_indexing(self):
+        grid = DenseGrid.from_string(EXAMPLE_GRID)
+        self.assertEqual((grid.width, grid.height), (3, 3))
+        self.assertEqual(grid[Point(1, 1)], "#")
+        self.assertEqual(grid[Point(2, 1)], ".")
+        self.assertEqual(grid.point(grid.index(Point(2, 1))), Point(2, 1))
+        self.assertIsNone(grid.get(Point(3, 0)))
+        self.assertEqual(list(grid.find("#")), [0, 4, 8])
+        self.assertEqual(str(grid), EXAMPLE_GRID)
+
+    def test_neighbors(self):
+        grid = DenseGrid.filled(3, 3)
+        self.assertEqual(sorted(grid.neighbors(0)), [1, 3])
+        self.assertEqual(sorted(grid.neighbors(4)), [1, 3, 5, 7])
+        self.assertEqual(sorted(grid.neighbors(5)), [2, 4, 8])
+        self.assertEqual(sorted(grid.neighbors(8)), [5, 7])
+
+    def test_adapters(self):
+        walls = {Point(0, 0), Point(1, 1), Point(2, 2)}
+        grid = DenseGrid.from_points(walls, 3, 3)
+        self.assertEqual(str(grid), EXAMPLE_GRID)
+        self.assertEqual(DenseGrid.from_dict(grid.to_dict()), grid)
+
+
+class UnionFindTestCase(unittest.TestCase):
+    def test_union(self):
+        sets = UnionFind(5)
+        sets.union(0, 1)
+        sets.union(3, 4)
+        self.assertTrue(sets.connected(1, 0))
+        self.assertFalse(sets.connected(1, 3))
+        sets.union(1, 4)
+        self.assertTrue(sets.connected(0, 3))
+        self.assertFalse(sets.connected(2, 3))
+
+
+class MemoCacheTestCase(unittest.TestCase):
+    def test_lru(self):
+        memo: MemoCache[str, int] = MemoCache(maxsize=2)
+        memo.put("a", 1)
+        memo.put("b", 2)
+        self.assertEqual(memo.get("a"), 1)
+        memo.put("c", 3)
+        self.assertIsNone(memo.get("b"))
+        self.assertEqual(memo.get("c"), 3)
+        self.assertEqual(len(memo), 2)
+        self.assertEqual(memo.stats, CacheStats(hits=2, misses=1, evictions=1))
+
+        memo.clear()
+        self.assertEqual(len(memo), 0)
+        self.assertEqual(memo.stats, CacheStats())
+
+
+class HeadingDistancesTestCase(unittest.TestCase):
+    def test_corridor(self):
+        grid = DenseGrid.from_string("...\n.#.\n...")
+        east, south = 1, 2
+        distance = heading_distances(grid, [0 * 4 + east])
+        self.assertEqual(distance[2 * 4 + east], 2)
+        self.assertEqual(distance[8 * 4 + south], 1004)
+        self.assertEqual(distance[4 * 4 + east], UNREACHED)
+
+        backward = heading_distances(grid, [8 * 4 + south], reverse=True)
+        self.assertEqual(backward[0 * 4 + east], 1004)